@@ -1,8 +1,10 @@
 from flask import Blueprint, render_template, redirect, url_for, flash, request, session
 from flask_login import login_required, current_user, login_user, logout_user
 from functools import wraps
-from models import db, User, Job
+from models import db, User, Job, job_cards
 from app import bcrypt
+from ratelimit import limiter
+from prerender import queue_prerender
 
 admin = Blueprint('admin_dashboard', __name__, url_prefix='/admin')
 
@@ -26,6 +28,7 @@ def admin_required(f):
     return decorated_function
 
 @admin.route('/login', methods=['GET', 'POST'])
+@limiter.limit('10/hour', methods=['POST'])
 def login():
     """Admin login page."""
     # If already logged in as admin and authenticated, redirect to dashboard
@@ -73,7 +76,7 @@ def dashboard():
         'pending_jobs': Job.query.filter_by(status='pending').count()
     }
     recent_users = User.query.order_by(User.created_at.desc()).limit(5).all()
-    recent_jobs = Job.query.order_by(Job.created_at.desc()).limit(5).all()
+    recent_jobs = job_cards().order_by(Job.created_at.desc()).limit(5).all()
     
     return render_template('admin/dashboard.html', 
                          stats=stats,
@@ -93,7 +96,9 @@ def manage_users():
 def manage_jobs():
     """Job listing management interface."""
     page = request.args.get('page', 1, type=int)
-    jobs = Job.query.paginate(page=page, per_page=10)
+    jobs = job_cards(User.username.label('author_username')).join(
+        User, Job.user_id == User.id
+    ).paginate(page=page, per_page=10)
     return render_template('admin/jobs.html', jobs=jobs)
 
 @admin.route('/users/<int:user_id>/toggle-status', methods=['POST'])
@@ -108,7 +113,7 @@ def toggle_user_status(user_id):
         db.session.commit()
         status = 'activated' if user.is_active else 'deactivated'
         flash(f'✨ User {user.username} has been {status}.', 'success')
-    return redirect(url_for('admin.manage_users'))
+    return redirect(url_for('admin_dashboard.manage_users'))
 
 @admin.route('/jobs/<int:job_id>/toggle-status', methods=['POST'])
 @admin_required
@@ -116,6 +121,7 @@ def toggle_job_status(job_id):
     """Toggle job active status."""
     job = Job.query.get_or_404(job_id)
     job.status = 'active' if job.status == 'inactive' else 'inactive'
+    queue_prerender(job)
     db.session.commit()
     flash(f'✨ Job "{job.title}" status updated to {job.status}.', 'success')
-    return redirect(url_for('admin.manage_jobs'))
+    return redirect(url_for('admin_dashboard.manage_jobs'))
@@ -0,0 +1,290 @@
+from flask import Blueprint, render_template, request, flash, redirect, url_for, current_app
+from flask_login import login_required, current_user
+from collections import defaultdict
+from datetime import datetime
+from itertools import groupby
+import threading
+from sqlalchemy import select, update
+from models import db, Job, User, SavedSearch, JobAlert
+from forms import SaveSearchForm, DeleteSearchForm
+from tasks import task, enqueue
+
+# Create Blueprint for saved searches and job alerts
+alerts = Blueprint('alerts', __name__)
+
+SYNC_BATCH_SIZE = 5000
+DIGEST_BATCH_SIZE = 500
+
+
+def _grams(text):
+    """Return every 1-, 2- and 3-character substring of text"""
+    grams = set()
+    for size in (1, 2, 3):
+        for i in range(len(text) - size + 1):
+            grams.add(text[i:i + size])
+    return grams
+
+
+class SearchPercolator:
+    """Reverse index over saved searches: the queries are indexed and each new job probes it.
+
+    Every saved search is filed under a single anchor key. Substring criteria
+    (keywords, location) are anchored on one of their trigrams, since any text
+    containing the criterion must contain all of its trigrams; exact criteria
+    (type, experience) are anchored on their value. A job therefore only has
+    to look up the keys it produces and verify the few candidates it finds,
+    instead of running every saved search against the table.
+    """
+
+    def __init__(self):
+        self._buckets = defaultdict(set)
+        self._criteria = {}
+        self._anchors = {}
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return len(self._criteria)
+
+    def _anchor(self, field, value):
+        if len(value) < 3:
+            return (field, value)
+        # Prefer the least crowded trigram to keep buckets balanced
+        return min(((field, value[i:i + 3]) for i in range(len(value) - 2)),
+                   key=lambda key: len(self._buckets.get(key, ())))
+
+    def add(self, search_id, keywords, location, job_type, experience):
+        """Index a saved search"""
+        criteria = ((keywords or '').lower(), (location or '').lower(), job_type or '', experience or '')
+        keywords, location, job_type, experience = criteria
+
+        with self._lock:
+            self._remove(search_id)
+            # Kept without an anchor, so sync() knows it has seen it; it can never match
+            self._criteria[search_id] = criteria
+            if not any(criteria):
+                return
+            if keywords:
+                key = self._anchor('q', keywords)
+            elif location:
+                key = self._anchor('loc', location)
+            elif job_type:
+                key = ('type', job_type)
+            else:
+                key = ('exp', experience)
+            self._buckets[key].add(search_id)
+            self._anchors[search_id] = key
+
+    def discard(self, search_id):
+        """Remove a saved search from the index"""
+        with self._lock:
+            self._remove(search_id)
+
+    def _remove(self, search_id):
+        key = self._anchors.pop(search_id, None)
+        if key is not None:
+            self._buckets[key].discard(search_id)
+            if not self._buckets[key]:
+                del self._buckets[key]
+        self._criteria.pop(search_id, None)
+
+    def sync(self):
+        """Bring the index in line with the saved_search table, which other processes also change"""
+        # Snapshot first: searches this process adds meanwhile must not look deleted
+        with self._lock:
+            indexed = set(self._criteria)
+        live = set(db.session.scalars(select(SavedSearch.id)))
+
+        # Compare whole id sets rather than trusting a high-water mark, since
+        # concurrent transactions can commit ids out of order
+        missing = sorted(live - indexed)
+        for i in range(0, len(missing), SYNC_BATCH_SIZE):
+            rows = db.session.query(
+                SavedSearch.id,
+                SavedSearch.keywords,
+                SavedSearch.location,
+                SavedSearch.job_type,
+                SavedSearch.experience_level
+            ).filter(SavedSearch.id.in_(missing[i:i + SYNC_BATCH_SIZE]))
+            for row in rows:
+                self.add(*row)
+
+        with self._lock:
+            for search_id in indexed - live:
+                self._remove(search_id)
+
+    def match(self, job):
+        """Return the ids of saved searches matching a job"""
+        text = '\0'.join((job.title or '', job.company or '', job.description or '', job.skills or '')).lower()
+        location = (job.location or '').lower()
+
+        keys = [('q', gram) for gram in _grams(text)]
+        keys += [('loc', gram) for gram in _grams(location)]
+        keys += [('type', job.job_type or ''), ('exp', job.experience_level or '')]
+
+        with self._lock:
+            candidates = set()
+            for key in keys:
+                candidates.update(self._buckets.get(key, ()))
+
+            fields = [(job.title or '').lower(), (job.company or '').lower(),
+                      (job.description or '').lower(), (job.skills or '').lower()]
+            matched = []
+            for search_id in candidates:
+                keywords, wanted_location, job_type, experience = self._criteria[search_id]
+                if keywords and not any(keywords in field for field in fields):
+                    continue
+                if wanted_location and wanted_location not in location:
+                    continue
+                if job_type and job_type != job.job_type:
+                    continue
+                if experience and experience != job.experience_level:
+                    continue
+                matched.append(search_id)
+        return matched
+
+
+def get_percolator():
+    """Return the saved-search index for the current app"""
+    return current_app.extensions.setdefault('search_percolator', SearchPercolator())
+
+
+@task('alerts.match_job')
+def match_job(job_id):
+    """Match a job against all saved searches and record an alert for each hit"""
+    job = Job.query.get(job_id)
+    if job is None or job.is_deleted or job.status != 'active':
+        return 0
+
+    percolator = get_percolator()
+    percolator.sync()
+    search_ids = percolator.match(job)
+    if not search_ids:
+        return 0
+
+    # Confirm against the table, since searches may have been deleted by another
+    # process, and skip alerts already recorded by an earlier attempt
+    already_alerted = db.session.query(JobAlert.saved_search_id).filter_by(job_id=job.id)
+    searches = db.session.query(SavedSearch.id, SavedSearch.user_id).filter(
+        SavedSearch.id.in_(search_ids),
+        SavedSearch.id.not_in(already_alerted),
+        SavedSearch.user_id != job.user_id
+    ).all()
+    for search_id, user_id in searches:
+        db.session.add(JobAlert(saved_search_id=search_id, job_id=job.id, user_id=user_id))
+    db.session.commit()
+    return len(searches)
+
+
+def queue_job_match(job):
+    """Queue matching of a new job against saved searches; call before committing the job"""
+    db.session.flush()
+    # The database may hand a deleted job's id to a new one, so the key includes the posting time too
+    enqueue('alerts.match_job', idempotency_key=f'alerts.match_job:{job.id}:{job.created_at.isoformat()}',
+            job_id=job.id)
+
+
+def send_alert_digests():
+    """Collect pending alerts into one digest per user and mark them as notified"""
+    now = datetime.utcnow()
+    digests = 0
+    last_user_id = 0
+    while True:
+        # A batch of users at a time, loading only the columns the digest shows
+        user_ids = [user_id for (user_id,) in db.session.query(JobAlert.user_id).filter(
+            JobAlert.notified_at.is_(None),
+            JobAlert.user_id > last_user_id
+        ).distinct().order_by(JobAlert.user_id).limit(DIGEST_BATCH_SIZE)]
+        if not user_ids:
+            break
+
+        pending = db.session.query(
+            JobAlert.id, JobAlert.user_id, User.username, User.email, Job.id.label('job_id'), Job.title, Job.company
+        ).join(
+            Job, JobAlert.job_id == Job.id
+        ).join(
+            User, JobAlert.user_id == User.id
+        ).filter(
+            JobAlert.notified_at.is_(None),
+            JobAlert.user_id.in_(user_ids)
+        ).order_by(JobAlert.user_id, JobAlert.created_at).all()
+
+        for _, rows in groupby(pending, key=lambda row: row.user_id):
+            rows = list(rows)
+            jobs = {row.job_id: f'{row.title} at {row.company}' for row in rows}
+            current_app.logger.info(
+                'Job alert digest for %s <%s>: %s',
+                rows[0].username, rows[0].email, '; '.join(jobs.values())
+            )
+            digests += 1
+
+        if pending:
+            db.session.execute(update(JobAlert), [{'id': row.id, 'notified_at': now} for row in pending])
+        db.session.commit()
+        last_user_id = user_ids[-1]
+    return digests
+
+
+@alerts.route('/alerts')
+@login_required
+def manage_alerts():
+    """List the current user's saved searches and recent matches"""
+    searches = SavedSearch.query.filter_by(user_id=current_user.id).order_by(SavedSearch.created_at.desc()).all()
+    matches = JobAlert.query.filter_by(user_id=current_user.id).order_by(JobAlert.created_at.desc()).limit(20).all()
+    return render_template('alerts/index.html', searches=searches, matches=matches,
+                           delete_form=DeleteSearchForm())
+
+
+@alerts.route('/alerts/save', methods=['POST'])
+@login_required
+def save_search():
+    """Save the current search criteria as a job alert"""
+    form = SaveSearchForm()
+    criteria = dict(
+        keywords=(form.q.data or '').strip(),
+        location=(form.location.data or '').strip(),
+        job_type=(form.type.data or '').strip(),
+        experience_level=(form.experience.data or '').strip()
+    )
+    back = url_for('jobs.search_jobs', q=criteria['keywords'], location=criteria['location'],
+                   type=criteria['job_type'], experience=criteria['experience_level'])
+
+    if not form.validate_on_submit():
+        flash('Your session has expired. Please try again.', 'error')
+        return redirect(back)
+
+    if not any(criteria.values()):
+        flash('Add at least one search filter before creating an alert.', 'error')
+        return redirect(back)
+
+    if SavedSearch.query.filter_by(user_id=current_user.id, **criteria).first():
+        flash('You already have an alert for this search.', 'info')
+        return redirect(back)
+
+    search = SavedSearch(user_id=current_user.id, **criteria)
+    db.session.add(search)
+    db.session.commit()
+    get_percolator().add(search.id, search.keywords, search.location, search.job_type, search.experience_level)
+    flash('Search saved! We will let you know when new jobs match.', 'success')
+    return redirect(back)
+
+
+@alerts.route('/alerts/<int:search_id>/delete', methods=['POST'])
+@login_required
+def delete_search(search_id):
+    """Delete a saved search and its alerts"""
+    if not DeleteSearchForm().validate_on_submit():
+        flash('Your session has expired. Please try again.', 'error')
+        return redirect(url_for('alerts.manage_alerts'))
+
+    search = SavedSearch.query.get_or_404(search_id)
+
+    # Ensure only the owner can delete
+    if search.user_id != current_user.id:
+        flash('You do not have permission to delete this alert.', 'error')
+        return redirect(url_for('alerts.manage_alerts'))
+
+    db.session.delete(search)
+    db.session.commit()
+    get_percolator().discard(search_id)
+    flash('Job alert deleted.', 'success')
+    return redirect(url_for('alerts.manage_alerts'))
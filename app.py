@@ -7,9 +7,15 @@ from wtforms.validators import InputRequired, Length, ValidationError, Email
 from flask_bcrypt import Bcrypt
 from flask_login import LoginManager, login_user, login_required, logout_user, current_user
 from flask_session import Session
+from werkzeug.middleware.proxy_fix import ProxyFix
 from datetime import timedelta
-from models import db, User, Job
-from jobs import jobs
+from models import db, User, Job, job_cards
+from jobs import jobs, active_job_cards, UploadRequest
+from sqlite_profile import configure_sqlite
+from templating import configure_templates
+from static_assets import static_assets
+from ratelimit import limiter
+from tasks import init_worker
 
 # Initialize extensions
 bcrypt = Bcrypt()
@@ -23,30 +29,67 @@ migrate = Migrate()
 def create_app():
     """Factory function for creating the Flask application with modern configuration"""
     app = Flask(__name__)
+    app.request_class = UploadRequest
     
     # Configuration
     app.config.update(
         SQLALCHEMY_DATABASE_URI=os.getenv('DATABASE_URL', 'sqlite:///openjobs.db'),
         SECRET_KEY=os.getenv('SECRET_KEY'),
         SQLALCHEMY_TRACK_MODIFICATIONS=False,
-        TEMPLATES_AUTO_RELOAD=True,
+        # Follows debug mode unless set; production skips the per-render template stat
+        TEMPLATES_AUTO_RELOAD=os.getenv('TEMPLATES_AUTO_RELOAD', '').lower() in ('1', 'true', 'yes') or None,
+        ASSETS_TAILWIND_COMMAND=os.getenv('ASSETS_TAILWIND_COMMAND', 'npx @tailwindcss/cli'),
+        # Static pages of active jobs for a front proxy; unset disables pre-rendering
+        PRERENDER_DIR=os.getenv('PRERENDER_DIR'),
+        PRERENDER_BASE_URL=os.getenv('PRERENDER_BASE_URL', 'http://localhost'),
+        PRERENDER_BOARD_PAGES=10,
+        TEMPLATE_CACHE_DIR=os.getenv('TEMPLATE_CACHE_DIR', os.path.join(app.instance_path, 'jinja_cache')),
         SQLALCHEMY_ENGINE_OPTIONS={
             'pool_pre_ping': True,
             'pool_recycle': 300,
             'pool_timeout': 20
         },
+        # Async engine for asgi.py; derived from DATABASE_URL when unset
+        ASYNC_DATABASE_URL=os.getenv('ASYNC_DATABASE_URL'),
+        # Opt-in WAL / tuned pragmas / serialized writes for SQLite deployments
+        SQLITE_PRODUCTION=os.getenv('SQLITE_PRODUCTION', '').lower() in ('1', 'true', 'yes'),
         SESSION_TYPE='filesystem',
         PERMANENT_SESSION_LIFETIME=timedelta(days=7),
         ADMIN_LOGIN_REQUIRED=True,
+        RESUME_UPLOAD_FOLDER=os.getenv('RESUME_UPLOAD_FOLDER', os.path.join(app.instance_path, 'resumes')),
+        MAX_RESUME_SIZE=5 * 1024 * 1024,
         WTF_CSRF_ENABLED=True,
-        RATELIMIT_DEFAULT='100/hour'
+        RATELIMIT_ENABLED=os.getenv('RATELIMIT_ENABLED', 'true').lower() not in ('0', 'false', 'no'),
+        RATELIMIT_DEFAULT=os.getenv('RATELIMIT_DEFAULT', '100/hour'),
+        RATELIMIT_STORAGE_PATH=os.getenv('RATELIMIT_STORAGE_PATH', os.path.join(app.instance_path, 'ratelimit.db')),
+        # Number of proxies in front of the app whose X-Forwarded-For is trusted; 0 uses the socket address
+        PROXY_FIX_X_FOR=int(os.getenv('PROXY_FIX_X_FOR', '0')),
+        # Background tasks: set TASK_WORKER_THREADS=0 when running a separate `flask worker`
+        TASK_WORKER_THREADS=int(os.getenv('TASK_WORKER_THREADS', '2')),
+        TASK_POLL_INTERVAL=1.0,
+        TASK_MAX_ATTEMPTS=5,
+        TASK_RETRY_BACKOFF=2,
+        TASK_RETRY_BACKOFF_MAX=600,
+        TASK_VISIBILITY_TIMEOUT=300,
+        TASK_RETENTION=timedelta(days=7)
     )
 
+    # Take the client address from the proxy, so rate limits are per visitor rather than per proxy
+    if app.config['PROXY_FIX_X_FOR']:
+        app.wsgi_app = ProxyFix(app.wsgi_app, x_for=app.config['PROXY_FIX_X_FOR'])
+
     # Initialize extensions with app
     db.init_app(app)
+    with app.app_context():
+        configure_sqlite(app, db.engine)
     bcrypt.init_app(app)
     login_manager.init_app(app)
     migrate.init_app(app, db)
+    # Ahead of the limiter, so a rate-limited first request still starts the task workers
+    init_worker(app)
+    limiter.init_app(app)
+    configure_templates(app)
+    static_assets.init_app(app)
 
     # Configure session handling
     Session(app)
@@ -59,14 +102,25 @@ def create_app():
     # Register blueprints
     from jobs import jobs
     from admin import admin as admin_blueprint
+    from alerts import alerts
     
     app.register_blueprint(jobs)
     app.register_blueprint(admin_blueprint)
+    app.register_blueprint(alerts)
 
     # Register CLI commands
-    from cli import init_db_command, create_admin_command
+    from cli import (init_db_command, create_admin_command, send_alert_digests_command, worker_command,
+                     task_stats_command, reconcile_application_counts_command, compile_templates_command,
+                     build_assets_command, prerender_command)
     app.cli.add_command(init_db_command)
     app.cli.add_command(create_admin_command)
+    app.cli.add_command(send_alert_digests_command)
+    app.cli.add_command(worker_command)
+    app.cli.add_command(task_stats_command)
+    app.cli.add_command(reconcile_application_counts_command)
+    app.cli.add_command(compile_templates_command)
+    app.cli.add_command(build_assets_command)
+    app.cli.add_command(prerender_command)
 
     # Register error handlers
     register_error_handlers(app)
@@ -89,6 +143,11 @@ def register_error_handlers(app):
     def not_found_error(error):
         return render_template('errors/404.html'), 404
 
+    @app.errorhandler(429)
+    def rate_limit_error(error):
+        headers = {'Retry-After': str(error.retry_after)} if error.retry_after is not None else {}
+        return render_template('errors/429.html', retry_after=error.retry_after), 429, headers
+
     @app.errorhandler(500)
     def internal_error(error):
         db.session.rollback()
@@ -146,13 +205,11 @@ def register_error_handlers(app):
             return redirect(url_for('admin_setup'))
 
         # Get latest jobs for the homepage
-        latest_jobs = Job.query.filter_by(
-            status='active',
-            is_deleted=False
-        ).order_by(Job.created_at.desc()).limit(6).all()
+        latest_jobs = active_job_cards().limit(6).all()
         return render_template('index.html', latest_jobs=latest_jobs)
 
     @app.route('/register', methods=['GET', 'POST'])
+    @limiter.limit('10/hour', methods=['POST'])
     def register():
         form = RegisterForm()
         if form.validate_on_submit():
@@ -170,6 +227,7 @@ def register_error_handlers(app):
         return render_template('register.html', form=form)
 
     @app.route('/login', methods=['GET', 'POST'])
+    @limiter.limit('20/hour', methods=['POST'])
     def login():
         form = LoginForm()
         if form.validate_on_submit():
@@ -197,7 +255,7 @@ def register_error_handlers(app):
     @login_required
     def dashboard():
         # Get user's posted jobs
-        user_jobs = Job.query.filter_by(user_id=current_user.id).order_by(Job.created_at.desc()).all()
+        user_jobs = job_cards().filter(Job.user_id == current_user.id).order_by(Job.created_at.desc()).all()
         return render_template('dashboard.html', name=current_user.username, jobs=user_jobs)
 
     @app.route('/admin-setup', methods=['GET', 'POST'])
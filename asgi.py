@@ -0,0 +1,215 @@
+import io
+import sys
+try:
+    from asgiref.wsgi import WsgiToAsgi
+    from sqlalchemy.ext.asyncio import async_sessionmaker, create_async_engine
+except ImportError as e:
+    raise ImportError('The async serving mode needs the packages in requirements-async.txt') from e
+from flask import abort, g, redirect, render_template, request, session, url_for, current_app
+from flask_login import current_user
+from sqlalchemy import func, select
+from werkzeug.exceptions import HTTPException
+from app import create_app
+from forms import SaveSearchForm
+from jobs import active_job_cards, search_job_cards
+from models import db, Job, User, PrefetchedPagination
+from sqlite_profile import configure_sqlite
+from tasks import ensure_worker
+
+ASYNC_DRIVERS = {
+    'sqlite': 'sqlite+aiosqlite',
+    'postgresql': 'postgresql+asyncpg'
+}
+
+
+def async_database_url(app):
+    """Return ASYNC_DATABASE_URL, or the app's database URL with an async driver."""
+    if app.config.get('ASYNC_DATABASE_URL'):
+        return app.config['ASYNC_DATABASE_URL']
+    with app.app_context():
+        url = db.engine.url
+    driver = ASYNC_DRIVERS.get(url.get_backend_name())
+    if driver is None:
+        raise RuntimeError(f'No async driver known for {url.get_backend_name()!r}; set ASYNC_DATABASE_URL')
+    return url.set(drivername=driver)
+
+
+async def paginate(db_session, query, per_page):
+    """Async counterpart of Query.paginate() for the current request's ?page="""
+    page = request.args.get('page', 1, type=int)
+    items, total = [], 0
+    if page >= 1:
+        statement = query.statement
+        items = (await db_session.execute(statement.limit(per_page).offset((page - 1) * per_page))).all()
+        total = await db_session.scalar(select(func.count()).select_from(statement.order_by(None).subquery()))
+    return PrefetchedPagination(page=page, per_page=per_page, items=items, total=total)
+
+
+# Async versions of the read-only views; they must render the same pages as the sync ones
+
+async def index(db_session):
+    admin_exists = await db_session.scalar(select(User.id).filter_by(is_admin=True).limit(1))
+    if admin_exists is None:
+        return redirect(url_for('admin_setup'))
+
+    latest_jobs = (await db_session.execute(active_job_cards().limit(6).statement)).all()
+    return render_template('index.html', latest_jobs=latest_jobs)
+
+
+async def job_board(db_session):
+    jobs = await paginate(db_session, active_job_cards(), per_page=10)
+    return render_template('jobs/board.html', jobs=jobs)
+
+
+async def view_job(db_session, job_id):
+    job = await db_session.get(Job, job_id)
+    if job is None:
+        abort(404)
+    return render_template('jobs/view.html', job=job)
+
+
+async def search_jobs(db_session):
+    query = request.args.get('q', '')
+    location = request.args.get('location', '')
+    job_type = request.args.get('type', '')
+    experience = request.args.get('experience', '')
+
+    jobs = await paginate(db_session, search_job_cards(query, location, job_type, experience), per_page=10)
+    # Only signed-in users can save a search; don't start a session for anyone else
+    save_form = None
+    if current_user.is_authenticated:
+        save_form = SaveSearchForm(q=query, location=location, type=job_type, experience=experience)
+    return render_template('jobs/search.html', jobs=jobs, query=query, location=location,
+                           job_type=job_type, experience=experience, save_form=save_form)
+
+
+ASYNC_VIEWS = {
+    'index': index,
+    'jobs.job_board': job_board,
+    'jobs.view_job': view_job,
+    'jobs.search_jobs': search_jobs
+}
+
+
+def build_environ(scope):
+    """Build the WSGI environ for a bodyless ASGI HTTP request."""
+    script_name = scope.get('root_path', '').encode('utf8').decode('latin1')
+    path_info = scope['path'].encode('utf8').decode('latin1')
+    if path_info.startswith(script_name):
+        path_info = path_info[len(script_name):]
+    server = scope.get('server') or ('localhost', 80)
+    environ = {
+        'REQUEST_METHOD': scope['method'],
+        'SCRIPT_NAME': script_name,
+        'PATH_INFO': path_info,
+        'QUERY_STRING': scope['query_string'].decode('ascii'),
+        'SERVER_NAME': server[0],
+        'SERVER_PORT': str(server[1]),
+        'SERVER_PROTOCOL': f"HTTP/{scope['http_version']}",
+        'REMOTE_ADDR': (scope.get('client') or ('',))[0],
+        'wsgi.version': (1, 0),
+        'wsgi.url_scheme': scope.get('scheme', 'http'),
+        'wsgi.input': io.BytesIO(),
+        'wsgi.errors': sys.stderr,
+        'wsgi.multithread': True,
+        'wsgi.multiprocess': True,
+        'wsgi.run_once': False
+    }
+    for name, value in scope.get('headers', []):
+        name = name.decode('latin1').upper().replace('-', '_')
+        if name not in ('CONTENT_LENGTH', 'CONTENT_TYPE'):
+            name = f'HTTP_{name}'
+        value = value.decode('latin1')
+        environ[name] = f'{environ[name]},{value}' if name in environ else value
+    return environ
+
+
+class AsyncReadApp:
+    """ASGI app running ASYNC_VIEWS natively and everything else through WSGI."""
+
+    def __init__(self, flask_app):
+        self.flask_app = flask_app
+        self.wsgi = WsgiToAsgi(flask_app)
+        self.engine = create_async_engine(
+            async_database_url(flask_app),
+            **flask_app.config['SQLALCHEMY_ENGINE_OPTIONS']
+        )
+        configure_sqlite(flask_app, self.engine.sync_engine)
+        self.sessions = async_sessionmaker(self.engine, expire_on_commit=False)
+
+    async def __call__(self, scope, receive, send):
+        if scope['type'] == 'lifespan':
+            return await self._lifespan(receive, send)
+
+        if scope['type'] == 'http' and scope['method'] in ('GET', 'HEAD'):
+            environ = build_environ(scope)
+            adapter = self.flask_app.url_map.bind_to_environ(
+                environ, server_name=self.flask_app.config['SERVER_NAME']
+            )
+            try:
+                endpoint, view_args = adapter.match()
+            except HTTPException:
+                endpoint = None
+            if endpoint in ASYNC_VIEWS:
+                return await self._dispatch(ASYNC_VIEWS[endpoint], environ, send)
+
+        await self.wsgi(scope, receive, send)
+
+    async def _lifespan(self, receive, send):
+        while True:
+            message = await receive()
+            if message['type'] == 'lifespan.startup':
+                ensure_worker(self.flask_app)
+                await send({'type': 'lifespan.startup.complete'})
+            elif message['type'] == 'lifespan.shutdown':
+                await self.engine.dispose()
+                await send({'type': 'lifespan.shutdown.complete'})
+                return
+
+    async def _load_user(self, db_session):
+        # Load the logged-in user on the async engine so Flask-Login doesn't
+        # query the sync one; anything else (remember cookies) falls through
+        login_manager = current_app.login_manager
+        user_id = session.get('_user_id')
+        if user_id is None or login_manager._session_protection_failed():
+            return
+        user = await db_session.get(User, int(user_id))
+        if user is not None:
+            g._login_user = user
+
+    async def _dispatch(self, view, environ, send):
+        """Mirror Flask.wsgi_app() / full_dispatch_request() for an async view."""
+        app = self.flask_app
+        ctx = app.request_context(environ)
+        error = None
+        try:
+            ctx.push()
+            try:
+                rv = app.preprocess_request()
+                if rv is None:
+                    async with self.sessions() as db_session:
+                        await self._load_user(db_session)
+                        rv = await view(db_session, **request.view_args)
+            except Exception as e:
+                rv = app.handle_user_exception(e)
+            response = app.finalize_request(rv)
+        except Exception as e:
+            error = e
+            response = app.handle_exception(e)
+        finally:
+            ctx.pop(error)
+
+        body = b''.join(response.get_app_iter(environ))
+        await send({
+            'type': 'http.response.start',
+            'status': response.status_code,
+            'headers': [
+                (name.lower().encode('latin1'), value.encode('latin1'))
+                for name, value in response.get_wsgi_headers(environ).items()
+            ]
+        })
+        await send({'type': 'http.response.body', 'body': body})
+
+
+flask_app = create_app()
+app = AsyncReadApp(flask_app)
@@ -0,0 +1,148 @@
+"""Throughput benchmark for the async serving mode (uvicorn asgi:app) against gunicorn.
+
+    pip install -r requirements-async.txt gunicorn
+    python benchmarks/async_throughput.py --workers 2 --connections 200 --duration 10
+"""
+import argparse
+import asyncio
+import os
+import random
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import seed_data
+from tasks import percentile
+
+
+def _environ(database_url):
+    return dict(
+        os.environ,
+        PYTHONPATH=ROOT,
+        SECRET_KEY='benchmark',
+        DATABASE_URL=database_url,
+        TASK_WORKER_THREADS='0',
+        RATELIMIT_ENABLED='0'
+    )
+
+
+def seed(database_url, jobs):
+    os.environ.update(_environ(database_url))
+    from app import create_app
+    seed_data.seed_jobs(create_app(), jobs)
+
+
+def _free_port():
+    with socket.socket() as sock:
+        sock.bind(('127.0.0.1', 0))
+        return sock.getsockname()[1]
+
+
+def start_server(mode, port, args, env, workdir):
+    if mode == 'wsgi':
+        command = ['gunicorn', '--workers', str(args.workers), '--threads', str(args.threads),
+                   '--bind', f'127.0.0.1:{port}', '--log-level', 'warning', 'app:create_app()']
+    else:
+        command = ['uvicorn', 'asgi:app', '--workers', str(args.workers),
+                   '--port', str(port), '--log-level', 'warning', '--no-access-log']
+    server = subprocess.Popen(command, cwd=workdir, env=env)
+
+    deadline = time.monotonic() + 30
+    while time.monotonic() < deadline:
+        try:
+            socket.create_connection(('127.0.0.1', port), timeout=1).close()
+            return server
+        except OSError:
+            time.sleep(0.2)
+    server.terminate()
+    raise RuntimeError(f'{mode} server did not start on port {port}')
+
+
+def _random_path(jobs):
+    return random.choice([
+        '/',
+        '/jobs',
+        f'/jobs/{random.randint(1, jobs)}',
+        f'/jobs/search?q=Engineer+{random.randint(1, 99)}&location=Remote'
+    ])
+
+
+async def _get(port, path):
+    reader, writer = await asyncio.open_connection('127.0.0.1', port)
+    try:
+        writer.write(f'GET {path} HTTP/1.1\r\nHost: 127.0.0.1\r\nConnection: close\r\n\r\n'.encode())
+        await writer.drain()
+        status_line = await reader.readline()
+        await reader.read()
+        return int(status_line.split()[1])
+    finally:
+        writer.close()
+
+
+async def load(port, connections, duration, jobs):
+    deadline = time.monotonic() + duration
+    latencies, errors = [], [0]
+
+    async def client():
+        while time.monotonic() < deadline:
+            started = time.perf_counter()
+            try:
+                status = await _get(port, _random_path(jobs))
+            except OSError:
+                status = None
+            if status == 200:
+                latencies.append((time.perf_counter() - started) * 1000)
+            else:
+                errors[0] += 1
+
+    await asyncio.gather(*(client() for _ in range(connections)))
+    return latencies, errors[0]
+
+
+def run(mode, args, env, workdir):
+    port = _free_port()
+    server = start_server(mode, port, args, env, workdir)
+    try:
+        # Warm up templates and connection pools before measuring
+        asyncio.run(load(port, args.workers * 4, 2, args.jobs))
+        latencies, errors = asyncio.run(load(port, args.connections, args.duration, args.jobs))
+    finally:
+        server.terminate()
+        server.wait()
+
+    label = f'WSGI (gunicorn, {args.threads} threads/worker)' if mode == 'wsgi' else 'ASGI (uvicorn asgi:app)'
+    print(f'{label}:')
+    print(f'  {len(latencies) / args.duration:8.1f} req/s  ({errors} errors)')
+    if latencies:
+        print(f'  latency p50 {percentile(latencies, 0.5):.1f} ms, '
+              f'p95 {percentile(latencies, 0.95):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--workers', type=int, default=2, help='server worker processes')
+    parser.add_argument('--threads', type=int, default=4, help='threads per gunicorn worker')
+    parser.add_argument('--connections', type=int, default=100, help='concurrent client connections')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per run')
+    parser.add_argument('--jobs', type=int, default=500, help='jobs seeded before the runs')
+    parser.add_argument('--database-url', help='database to seed and serve (default: a temporary SQLite file)')
+    args = parser.parse_args()
+
+    # Servers run from a scratch directory so sessions and rate limit state stay out of the tree
+    workdir = tempfile.mkdtemp(prefix='openjobs-bench-')
+    os.chdir(workdir)
+    database_url = args.database_url or f"sqlite:///{os.path.join(workdir, 'bench.db')}"
+    seed(database_url, args.jobs)
+
+    env = _environ(database_url)
+    for mode in ('wsgi', 'asgi'):
+        run(mode, args, env, workdir)
+
+
+if __name__ == '__main__':
+    main()
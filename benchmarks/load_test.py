@@ -0,0 +1,315 @@
+"""Load test of every read route against a seeded data set, with results comparable between commits.
+
+    python benchmarks/load_test.py --scale 100k --output before.json
+    python benchmarks/load_test.py --scale 100k --compare before.json
+"""
+import argparse
+import json
+import os
+import platform
+import random
+import statistics
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timezone
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import seed_data
+
+SCALES = {'10k': 10_000, '100k': 100_000, '1m': 1_000_000}
+PER_PAGE = 10
+
+
+class Route:
+    def __init__(self, name, role, paths):
+        self.name = name
+        self.role = role
+        self.paths = paths
+
+
+class QueryCounter:
+    """Counts SQL statements executed by the current thread."""
+
+    def __init__(self, engine):
+        from sqlalchemy import event
+        self._local = threading.local()
+        event.listen(engine, 'before_cursor_execute', self._count)
+
+    def _count(self, *args):
+        self._local.count = getattr(self._local, 'count', 0) + 1
+
+    def reset(self):
+        self._local.count = 0
+
+    @property
+    def count(self):
+        return getattr(self._local, 'count', 0)
+
+
+def git_commit():
+    try:
+        commit = subprocess.check_output(['git', 'rev-parse', 'HEAD'], cwd=ROOT, text=True).strip()
+        dirty = bool(subprocess.check_output(['git', 'status', '--porcelain', '--untracked-files=no'],
+                                             cwd=ROOT, text=True).strip())
+    except (OSError, subprocess.CalledProcessError):
+        return None, None
+    return commit, dirty
+
+
+def prepare_database(args):
+    """Return the database URL to test against, seeding it first if needed."""
+    from app import create_app
+    from models import db, User
+
+    if args.database_url:
+        os.environ['DATABASE_URL'] = args.database_url
+        app = create_app()
+        with app.app_context():
+            db.create_all()
+            empty = db.session.query(User.id).first() is None
+        if empty:
+            print(f'Seeding {args.jobs:,} jobs…', file=sys.stderr)
+            seed_data.seed(app, args.jobs, args.users, args.seed)
+        return args.database_url
+
+    cache_dir = os.path.join(ROOT, 'instance', 'benchmarks')
+    os.makedirs(cache_dir, exist_ok=True)
+    path = os.path.join(cache_dir, f'openjobs-{args.jobs}-{args.users or "auto"}-seed{args.seed}.db')
+    if not os.path.exists(path):
+        # Seed into a temporary file so an interrupted run never leaves a partial database behind
+        partial = path + '.partial'
+        if os.path.exists(partial):
+            os.remove(partial)
+        os.environ['DATABASE_URL'] = f'sqlite:///{partial}'
+        print(f'Seeding {args.jobs:,} jobs into {path}…', file=sys.stderr)
+        app = create_app()
+        seed_data.seed(app, args.jobs, args.users, args.seed)
+        with app.app_context():
+            # Closing the last connection also checkpoints a WAL journal into the file
+            db.engine.dispose()
+        os.replace(partial, path)
+    return f'sqlite:///{path}'
+
+
+def build_routes(app, rng, requests):
+    """Pick the paths each route is requested with, deterministically from rng."""
+    from sqlalchemy import func
+    from models import db, User, Job, Application
+
+    with app.app_context():
+        active = Job.query.filter(Job.status == 'active', Job.is_deleted.is_(False))
+        board_pages = max(1, -(-active.count() // PER_PAGE))
+        user_pages = max(1, -(-User.query.count() // PER_PAGE))
+        job_pages = max(1, -(-Job.query.count() // PER_PAGE))
+        max_job_id = db.session.query(func.max(Job.id)).scalar() or 0
+        python_pages = max(1, -(-active.filter(Job.skills.ilike('%Python%')).count() // PER_PAGE))
+
+        # Detail pages of active jobs spread over the whole table
+        candidates = [rng.randint(1, max_job_id) for _ in range(requests * 3)] if max_job_id else []
+        published = {job_id for (job_id,) in active.with_entities(Job.id).filter(Job.id.in_(candidates))}
+        job_ids = [job_id for job_id in candidates if job_id in published][:requests] or [1]
+
+        employer = User.query.filter_by(username='bench-employer').one()
+        applicants_job = db.session.query(Application.job_id).join(Job).filter(
+            Job.user_id == employer.id
+        ).group_by(Application.job_id).order_by(func.count().desc(), Application.job_id).limit(1).scalar()
+
+    def pages(first, last):
+        return [rng.randint(max(1, first), max(1, last)) for _ in range(requests)]
+
+    def deep(total):
+        # The last tenth of the pages, where OFFSET is largest
+        return pages(total - total // 10, total)
+
+    def searches(make):
+        return [f'/jobs/search?{make()}' for _ in range(requests)]
+
+    location = lambda: rng.choice(seed_data.LOCATIONS).split(',')[0]
+    return [
+        Route('index', None, ['/']),
+        Route('job_board', None, ['/jobs']),
+        Route('job_board_shallow', None, [f'/jobs?page={p}' for p in pages(2, min(10, board_pages))]),
+        Route('job_board_deep', None, [f'/jobs?page={p}' for p in deep(board_pages)]),
+        Route('search_keyword', None, searches(lambda: f'q={rng.choice(seed_data.SKILLS)}')),
+        Route('search_location', None, searches(lambda: f'location={location()}')),
+        Route('search_type_experience', None, searches(
+            lambda: f'type={rng.choice(seed_data.JOB_TYPES[0])}&experience={rng.choice(seed_data.EXPERIENCE_LEVELS[0])}'
+        )),
+        Route('search_combined', None, searches(
+            lambda: f'q={rng.choice(seed_data.SKILLS)}&location={location()}&type=Full-time'
+        )),
+        Route('search_no_match', None, ['/jobs/search?q=no-such-skill']),
+        Route('search_deep', None, [f'/jobs/search?q=Python&page={p}' for p in deep(python_pages)]),
+        Route('view_job', None, [f'/jobs/{job_id}' for job_id in job_ids]),
+        Route('dashboard', 'employer', ['/dashboard']),
+        Route('alerts', 'employer', ['/alerts']),
+        Route('applicants', 'employer', [f'/jobs/{applicants_job}/applicants'] if applicants_job else []),
+        Route('admin_dashboard', 'admin', ['/admin/']),
+        Route('admin_users', 'admin', ['/admin/users']),
+        Route('admin_users_deep', 'admin', [f'/admin/users?page={p}' for p in deep(user_pages)]),
+        Route('admin_jobs', 'admin', ['/admin/jobs']),
+        Route('admin_jobs_deep', 'admin', [f'/admin/jobs?page={p}' for p in deep(job_pages)])
+    ]
+
+
+class Runner:
+    """Sends requests from a thread pool, one test client per thread and role."""
+
+    USERS = {'employer': (2, False), 'admin': (1, True)}
+
+    def __init__(self, app, concurrency):
+        from models import db
+        self.app = app
+        self.concurrency = concurrency
+        self._local = threading.local()
+        with app.app_context():
+            self.queries = QueryCounter(db.engine)
+
+    def _client(self, role):
+        clients = self._local.__dict__.setdefault('clients', {})
+        if role not in clients:
+            client = self.app.test_client()
+            if role is not None:
+                user_id, admin = self.USERS[role]
+                with client.session_transaction() as session:
+                    session['_user_id'] = str(user_id)
+                    session['_fresh'] = True
+                    if admin:
+                        session['admin_authenticated'] = True
+            clients[role] = client
+        return clients[role]
+
+    def _request(self, role, path):
+        client = self._client(role)
+        self.queries.reset()
+        started = time.perf_counter()
+        response = client.get(path)
+        response.close()
+        return time.perf_counter() - started, response.status_code, self.queries.count
+
+    def run(self, route, requests, warmup):
+        paths = [route.paths[i % len(route.paths)] for i in range(requests)]
+        for path in paths[:warmup]:
+            self._request(route.role, path)
+
+        with ThreadPoolExecutor(self.concurrency) as pool:
+            started = time.perf_counter()
+            samples = list(pool.map(lambda path: self._request(route.role, path), paths))
+            elapsed = time.perf_counter() - started
+
+        latencies = sorted(latency * 1000 for latency, _, _ in samples)
+        percentiles = statistics.quantiles(latencies, n=100, method='inclusive') if len(latencies) > 1 else latencies * 99
+        queries = [count for _, _, count in samples]
+        return {
+            'requests': len(samples),
+            'errors': sum(status != 200 for _, status, _ in samples),
+            'p50_ms': round(percentiles[49], 3),
+            'p95_ms': round(percentiles[94], 3),
+            'p99_ms': round(percentiles[98], 3),
+            'mean_ms': round(statistics.fmean(latencies), 3),
+            'throughput_rps': round(len(samples) / elapsed, 1),
+            'queries_mean': round(statistics.fmean(queries), 2),
+            'queries_max': max(queries)
+        }
+
+
+def print_results(results, baseline=None):
+    header = f"{'route':<24}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'req/s':>10}{'queries':>9}{'errors':>8}"
+    print(header)
+    for name, r in results.items():
+        print(f"{name:<24}{r['p50_ms']:>10.2f}{r['p95_ms']:>10.2f}{r['p99_ms']:>10.2f}"
+              f"{r['throughput_rps']:>10.1f}{r['queries_mean']:>9.1f}{r['errors']:>8}")
+        old = (baseline or {}).get(name)
+        if old:
+            def change(key):
+                return f'{(r[key] - old[key]) / old[key] * 100:+.0f}%' if old[key] else 'n/a'
+            print(f"{'  vs baseline':<24}{change('p50_ms'):>10}{change('p95_ms'):>10}{change('p99_ms'):>10}"
+                  f"{change('throughput_rps'):>10}{r['queries_mean'] - old['queries_mean']:>+9.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--scale', choices=SCALES, default='10k', help='number of seeded jobs')
+    parser.add_argument('--jobs', type=int, help='seed this many jobs instead of a preset scale')
+    parser.add_argument('--users', type=int, help='users to seed (default: jobs / 4)')
+    parser.add_argument('--seed', type=int, default=seed_data.SEED, help='random seed for data and paths')
+    parser.add_argument('--database-url', help='test against this database, seeding it if it is empty')
+    parser.add_argument('--concurrency', type=int, default=8, help='threads sending requests')
+    parser.add_argument('--requests', type=int, default=200, help='measured requests per route')
+    parser.add_argument('--warmup', type=int, default=10, help='unmeasured requests per route first')
+    parser.add_argument('--routes', nargs='+', metavar='ROUTE', help='only run these routes')
+    parser.add_argument('--output', help='write the results as JSON to this file')
+    parser.add_argument('--compare', metavar='JSON', help='show changes against an earlier --output file')
+    args = parser.parse_args()
+    args.jobs = args.jobs or SCALES[args.scale]
+    # Relative to where the command was run, before moving to the work directory
+    output = args.output and os.path.abspath(args.output)
+    compare = args.compare and os.path.abspath(args.compare)
+
+    workdir = tempfile.mkdtemp(prefix='openjobs-bench-')
+    os.chdir(workdir)
+    os.environ.update(
+        SECRET_KEY='benchmark',
+        TASK_WORKER_THREADS='0',
+        RATELIMIT_ENABLED='0',
+        TEMPLATE_CACHE_DIR=os.path.join(workdir, 'jinja_cache'),
+        RATELIMIT_STORAGE_PATH=os.path.join(workdir, 'ratelimit.db')
+    )
+    # Measure the app itself, not pre-rendering or a proxy in front of it
+    os.environ.pop('PRERENDER_DIR', None)
+
+    database_url = prepare_database(args)
+    os.environ['DATABASE_URL'] = database_url
+    from app import create_app
+    app = create_app()
+
+    rng = random.Random(args.seed)
+    routes = build_routes(app, rng, args.requests)
+    if args.routes:
+        unknown = set(args.routes) - {route.name for route in routes}
+        if unknown:
+            parser.error(f"unknown routes: {', '.join(sorted(unknown))}")
+        routes = [route for route in routes if route.name in args.routes]
+
+    runner = Runner(app, args.concurrency)
+    results = {}
+    for route in routes:
+        if not route.paths:
+            print(f'skipping {route.name}: no data to request it with', file=sys.stderr)
+            continue
+        results[route.name] = runner.run(route, args.requests, args.warmup)
+
+    baseline = None
+    if compare:
+        with open(compare) as f:
+            baseline_run = json.load(f)
+        baseline = baseline_run['routes']
+        print(f"Baseline: {baseline_run.get('commit') or 'unknown commit'} ({baseline_run.get('created_at')})")
+    print_results(results, baseline)
+
+    if output:
+        commit, dirty = git_commit()
+        run = {
+            'commit': commit,
+            'dirty': dirty,
+            'created_at': datetime.now(timezone.utc).isoformat(timespec='seconds'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'database': database_url.split(':', 1)[0],
+            'params': {key: getattr(args, key) for key in ('jobs', 'users', 'seed', 'concurrency', 'requests', 'warmup')},
+            'routes': results
+        }
+        with open(output, 'w') as f:
+            json.dump(run, f, indent=2)
+        print(f'Results written to {args.output}')
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,268 @@
+"""Deterministic synthetic data for the benchmarks.
+
+    python benchmarks/seed_data.py --jobs 100000 --database-url sqlite:////tmp/openjobs-100k.db
+"""
+import argparse
+import os
+import random
+import sys
+import time
+from datetime import datetime, timedelta
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+SEED = 42
+PASSWORD = 'benchmark'
+# bcrypt's base64 alphabet, for a salt drawn from the seeded generator
+SALT_ALPHABET = './ABCDEFGHIJKLMNOPQRSTUVWXYZabcdefghijklmnopqrstuvwxyz0123456789'
+# Fixed reference point instead of now(), so dates are reproducible too
+EPOCH = datetime(2026, 1, 1)
+
+FIRST_NAMES = [
+    'Ada', 'Amara', 'Ben', 'Chen', 'Chidi', 'Daniel', 'Elena', 'Fatima', 'Grace', 'Hamish', 'Hiro', 'Ines',
+    'James', 'Kemi', 'Lars', 'Leila', 'Maria', 'Mohammed', 'Ngozi', 'Olu', 'Priya', 'Rafael', 'Sara', 'Tariq',
+    'Tunde', 'Uma', 'Victor', 'Wei', 'Yusuf', 'Zoe'
+]
+LAST_NAMES = [
+    'Adeyemi', 'Brown', 'Chen', 'Costa', 'Dubois', 'Eze', 'Fischer', 'Garcia', 'Hansen', 'Ibrahim', 'Jones',
+    'Kim', 'Kowalski', 'Lopez', 'Mensah', 'Müller', 'Nakamura', 'Novak', 'Okafor', 'Patel', 'Rossi', 'Silva',
+    'Smith', 'Tanaka', 'Walker', 'Wang'
+]
+EMAIL_DOMAINS = ['example.com', 'example.org', 'example.net', 'mail.example.com']
+
+SENIORITY = ['', '', 'Junior ', 'Senior ', 'Lead ', 'Principal ', 'Staff ']
+ROLES = [
+    'Software Engineer', 'Backend Developer', 'Frontend Developer', 'Full Stack Developer', 'Data Engineer',
+    'Data Scientist', 'DevOps Engineer', 'Site Reliability Engineer', 'Mobile Developer', 'QA Engineer',
+    'Product Manager', 'Product Designer', 'UX Researcher', 'Technical Writer', 'Security Engineer',
+    'Machine Learning Engineer', 'Engineering Manager', 'Support Engineer', 'Solutions Architect',
+    'Database Administrator'
+]
+COMPANY_PREFIXES = [
+    'Acme', 'Blue', 'Bright', 'Cloud', 'Delta', 'Green', 'Iron', 'Kite', 'Lagos', 'Lumen', 'Nova', 'Orbit',
+    'Pixel', 'Quartz', 'River', 'Summit', 'Swift', 'Terra', 'Vertex', 'Zenith'
+]
+COMPANY_SUFFIXES = ['Labs', 'Systems', 'Technologies', 'Software', 'Analytics', 'Health', 'Pay', 'Works', 'Digital', 'Ltd']
+LOCATIONS = [
+    'Lagos, Nigeria', 'Abuja, Nigeria', 'Nairobi, Kenya', 'Accra, Ghana', 'Cape Town, South Africa',
+    'Cairo, Egypt', 'London, UK', 'Manchester, UK', 'Berlin, Germany', 'Amsterdam, Netherlands',
+    'Paris, France', 'Lisbon, Portugal', 'New York, USA', 'San Francisco, USA', 'Austin, USA',
+    'Toronto, Canada', 'São Paulo, Brazil', 'Bangalore, India', 'Singapore', 'Sydney, Australia', 'Remote'
+]
+SKILLS = [
+    'Python', 'Django', 'Flask', 'SQL', 'PostgreSQL', 'Redis', 'JavaScript', 'TypeScript', 'React', 'Vue',
+    'Node.js', 'Go', 'Rust', 'Java', 'Kotlin', 'Swift', 'AWS', 'GCP', 'Azure', 'Docker', 'Kubernetes',
+    'Terraform', 'Linux', 'Git', 'GraphQL', 'REST', 'Kafka', 'Spark', 'Pandas', 'TensorFlow', 'PyTorch',
+    'Figma', 'CI/CD', 'Agile'
+]
+JOB_TYPES = (['Full-time', 'Part-time', 'Contract', 'Internship'], [70, 10, 15, 5])
+EXPERIENCE_LEVELS = (['Entry', 'Mid', 'Senior'], [25, 45, 30])
+REMOTE_OPTIONS = (['On-site', 'Hybrid', 'Remote'], [35, 40, 25])
+STATUSES = (['active', 'closed', 'pending'], [88, 8, 4])
+# Applications per job; most listings get few, some get many
+APPLICATION_COUNTS = (list(range(8)), [30, 25, 16, 10, 7, 5, 4, 3])
+
+DESCRIPTION_SENTENCES = [
+    'We are looking for a {role} to join our growing team at {company}.',
+    'You will work closely with product, design and engineering to ship features our customers love.',
+    'Our stack includes {skill_a} and {skill_b}, and we are always open to better tools.',
+    'You will own services end to end, from design documents to production monitoring.',
+    'We value clear writing, thoughtful code review and a calm on-call rotation.',
+    'The team is distributed across several time zones and collaborates asynchronously.',
+    'You will mentor other engineers and help shape our engineering practices.',
+    'This role reports to the head of engineering and is based in {location}.',
+    'We ship small changes often and measure their impact carefully.',
+    'Expect to spend time improving performance, reliability and developer experience.',
+    'You will help us scale to millions of users across Africa and beyond.',
+    'We offer a structured onboarding programme and a generous learning budget.'
+]
+REQUIREMENTS = [
+    '{years}+ years of professional experience', 'Strong knowledge of {skill_a}', 'Experience with {skill_b}',
+    'Good written and spoken English', 'Comfort working in a fast-moving team',
+    'Experience with automated testing', 'Familiarity with cloud infrastructure',
+    'A degree in computer science or equivalent experience'
+]
+BENEFITS = [
+    'Health insurance', 'Pension matching', 'Flexible hours', 'Remote working allowance',
+    '25 days of annual leave', 'Learning budget', 'Equity options', 'Parental leave', 'Home office setup'
+]
+COVER_LETTER = 'I am excited to apply for this role. My experience with {skill} makes me a strong fit for your team.'
+
+
+def _weighted(rng, choices):
+    values, weights = choices
+    return rng.choices(values, weights)[0]
+
+
+def _job_row(rng, user_id):
+    role = rng.choice(ROLES)
+    company = f'{rng.choice(COMPANY_PREFIXES)} {rng.choice(COMPANY_SUFFIXES)}'
+    location = rng.choice(LOCATIONS)
+    skills = rng.sample(SKILLS, rng.randint(3, 6))
+    fields = dict(role=role, company=company, location=location, skill_a=skills[0], skill_b=skills[1],
+                  years=rng.randint(1, 8))
+    description = ' '.join(s.format(**fields) for s in rng.sample(DESCRIPTION_SENTENCES, rng.randint(5, 9)))
+    salary = rng.randrange(30, 200, 5) * 1000
+    created_at = EPOCH - timedelta(seconds=rng.randrange(365 * 24 * 3600))
+    return dict(
+        title=f'{rng.choice(SENIORITY)}{role}',
+        company=company,
+        location=location,
+        description=description,
+        requirements='\n'.join('- ' + r.format(**fields) for r in rng.sample(REQUIREMENTS, rng.randint(3, 6))),
+        salary_range=f'${salary:,} - ${salary + rng.randrange(10, 60, 5) * 1000:,}',
+        job_type=_weighted(rng, JOB_TYPES),
+        experience_level=_weighted(rng, EXPERIENCE_LEVELS),
+        skills=', '.join(skills),
+        benefits=', '.join(rng.sample(BENEFITS, rng.randint(2, 5))),
+        remote_option=_weighted(rng, REMOTE_OPTIONS),
+        created_at=created_at,
+        deadline=created_at + timedelta(days=rng.randint(14, 60)),
+        status=_weighted(rng, STATUSES),
+        is_deleted=rng.random() < 0.02,
+        views_count=rng.randint(0, 5000),
+        user_id=user_id
+    )
+
+
+def _user_row(rng, n, password_hash):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return dict(
+        name=f'{first} {last}',
+        username=f'user{n}',
+        email=f'{first}.{last}.{n}@{rng.choice(EMAIL_DOMAINS)}'.lower(),
+        password=password_hash,
+        created_at=EPOCH - timedelta(seconds=rng.randrange(2 * 365 * 24 * 3600)),
+        is_active=rng.random() > 0.01,
+        is_admin=False
+    )
+
+
+def _insert(model, rows):
+    from sqlalchemy import insert
+    from models import db
+    if rows:
+        db.session.execute(insert(model), rows)
+        db.session.commit()
+    rows.clear()
+
+
+def job_row(n, user_id=1):
+    """A plain active listing, for benchmarks that need many similar jobs rather than realistic ones."""
+    return dict(
+        title=f'Benchmark Engineer {n}',
+        company='Benchmark Ltd',
+        location=('Remote', 'London', 'Berlin', 'New York')[n % 4],
+        description='Benchmark description. ' * 40,
+        requirements='Benchmark requirements. ' * 20,
+        job_type='Full-time',
+        experience_level='Mid',
+        skills='Python, SQL',
+        user_id=user_id
+    )
+
+
+def seed_jobs(app, jobs):
+    """Create an admin user (id 1) and that many plain listings in app's empty database."""
+    from models import db, User, Job
+    with app.app_context():
+        db.create_all()
+        db.session.add(User(name='Bench', username='bench', email='bench@example.com', password='x', is_admin=True))
+        db.session.commit()
+        db.session.add_all(Job(**job_row(n)) for n in range(jobs))
+        db.session.commit()
+
+
+def seed(app, jobs, users=None, seed=SEED, batch_size=5000, progress=True):
+    """Insert the synthetic data set into app's (empty) database; returns the row counts."""
+    import bcrypt
+    from models import db, make_excerpt, User, Job, Application, SavedSearch
+
+    rng = random.Random(seed)
+    users = users or max(100, jobs // 4)
+    # About one in twenty users posts jobs, so employers have a steady number of listings at any scale
+    employers = max(2, users // 20)
+
+    def report(message):
+        if progress:
+            print(f'  {message}', file=sys.stderr, flush=True)
+
+    started = time.perf_counter()
+    with app.app_context():
+        db.create_all()
+        # Low rounds: hashing is not what is being measured and all users share the hash
+        salt = '$2b$04$' + ''.join(rng.choice(SALT_ALPHABET) for _ in range(21)) + '.'
+        password_hash = bcrypt.hashpw(PASSWORD.encode(), salt.encode()).decode('utf-8')
+
+        # Fixed accounts for the load test to log in as, both with PASSWORD
+        batch = [
+            dict(name='Bench Admin', username='bench-admin', email='bench-admin@example.com',
+                 password=password_hash, created_at=EPOCH, is_active=True, is_admin=True),
+            dict(name='Bench Employer', username='bench-employer', email='bench-employer@example.com',
+                 password=password_hash, created_at=EPOCH, is_active=True, is_admin=False)
+        ]
+        for n in range(3, users + 1):
+            batch.append(_user_row(rng, n, password_hash))
+            if len(batch) >= batch_size:
+                _insert(User, batch)
+        _insert(User, batch)
+        report(f'{users:,} users')
+
+        # Job ids follow insertion order, so applications can refer to them directly
+        applications = 0
+        application_batch = []
+        for job_id in range(1, jobs + 1):
+            row = _job_row(rng, rng.randint(2, employers))
+            row['excerpt'] = make_excerpt(row['description'])
+            applicants = rng.sample(range(employers + 1, users + 1), _weighted(rng, APPLICATION_COUNTS))
+            row['applications_count'] = len(applicants)
+            batch.append(row)
+            for user_id in applicants:
+                application_batch.append(dict(
+                    job_id=job_id,
+                    user_id=user_id,
+                    name=f'Applicant {user_id}',
+                    email=f'applicant{user_id}@example.com',
+                    cover_letter=COVER_LETTER.format(skill=rng.choice(SKILLS)),
+                    resume_filename='resume.pdf',
+                    resume_path=f'{job_id}-{user_id}.pdf',
+                    resume_size=rng.randint(20_000, 400_000),
+                    created_at=row['created_at'] + timedelta(seconds=rng.randrange(14 * 24 * 3600))
+                ))
+            if len(batch) >= batch_size:
+                _insert(Job, batch)
+                applications += len(application_batch)
+                _insert(Application, application_batch)
+                report(f'{job_id:,} jobs')
+        _insert(Job, batch)
+        applications += len(application_batch)
+        _insert(Application, application_batch)
+
+        for keywords, location in (('Python', 'Lagos'), ('React', ''), ('', 'Remote')):
+            db.session.add(SavedSearch(user_id=2, keywords=keywords, location=location, created_at=EPOCH))
+        db.session.commit()
+
+    report(f'{jobs:,} jobs and {applications:,} applications in {time.perf_counter() - started:.1f}s')
+    return {'users': users, 'jobs': jobs, 'applications': applications}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--jobs', type=int, default=10_000, help='job listings to generate')
+    parser.add_argument('--users', type=int, help='users to generate (default: jobs / 4)')
+    parser.add_argument('--seed', type=int, default=SEED, help='random seed')
+    parser.add_argument('--batch-size', type=int, default=5000, help='rows per INSERT batch')
+    parser.add_argument('--database-url', required=True, help='database to fill; its tables must be empty')
+    args = parser.parse_args()
+
+    os.environ.update(
+        SECRET_KEY=os.getenv('SECRET_KEY', 'benchmark'),
+        DATABASE_URL=args.database_url,
+        TASK_WORKER_THREADS='0'
+    )
+    from app import create_app
+    seed(create_app(), args.jobs, args.users, args.seed, args.batch_size)
+
+
+if __name__ == '__main__':
+    main()
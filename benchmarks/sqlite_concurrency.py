@@ -0,0 +1,121 @@
+"""Concurrency benchmark for the SQLite production profile, with and without SQLITE_PRODUCTION.
+
+    python benchmarks/sqlite_concurrency.py --processes 4 --readers 4 --duration 10
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import seed_data
+
+
+def _make_app(db_path, production):
+    os.environ['SECRET_KEY'] = 'benchmark'
+    os.environ['DATABASE_URL'] = f'sqlite:///{db_path}'
+    os.environ['SQLITE_PRODUCTION'] = '1' if production else ''
+    os.environ['TASK_WORKER_THREADS'] = '0'
+    os.environ['RATELIMIT_ENABLED'] = '0'
+    from app import create_app
+    return create_app()
+
+
+def worker(db_path, production, readers, duration, max_job_id, results):
+    from models import db, Job
+    app = _make_app(db_path, production)
+    deadline = time.monotonic() + duration
+    reads, read_errors = [0], [0]
+    write_latencies, write_errors = [], [0]
+    lock = threading.Lock()
+
+    def read_loop():
+        client = app.test_client()
+        count = errors = 0
+        while time.monotonic() < deadline:
+            if random.random() < 0.5:
+                response = client.get('/jobs')
+            else:
+                response = client.get(f'/jobs/{random.randint(1, max_job_id)}')
+            if response.status_code == 200:
+                count += 1
+            else:
+                errors += 1
+        with lock:
+            reads[0] += count
+            read_errors[0] += errors
+
+    def write_loop():
+        with app.app_context():
+            n = 0
+            while time.monotonic() < deadline:
+                started = time.perf_counter()
+                try:
+                    db.session.add(Job(**seed_data.job_row(n)))
+                    db.session.commit()
+                    write_latencies.append((time.perf_counter() - started) * 1000)
+                except Exception:
+                    db.session.rollback()
+                    write_errors[0] += 1
+                n += 1
+                time.sleep(0.005)
+
+    threads = [threading.Thread(target=read_loop) for _ in range(readers)]
+    threads.append(threading.Thread(target=write_loop))
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    results.put((reads[0], read_errors[0], write_latencies, write_errors[0]))
+
+
+def run(production, args):
+    from tasks import percentile
+    workdir = tempfile.mkdtemp(prefix='openjobs-bench-')
+    os.chdir(workdir)
+    db_path = os.path.join(workdir, 'bench.db')
+    seed_data.seed_jobs(_make_app(db_path, production), args.jobs)
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(target=worker, args=(db_path, production, args.readers, args.duration, args.jobs, results))
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+    collected = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+
+    reads = sum(r[0] for r in collected)
+    read_errors = sum(r[1] for r in collected)
+    latencies = [latency for r in collected for latency in r[2]]
+    write_errors = sum(r[3] for r in collected)
+    label = 'production profile' if production else 'default settings'
+    print(f'{label}:')
+    print(f'  reads:  {reads / args.duration:8.1f} req/s  ({read_errors} errors)')
+    print(f'  writes: {len(latencies) / args.duration:8.1f} commits/s  ({write_errors} errors)')
+    if latencies:
+        print(f'  write latency p50 {percentile(latencies, 0.5):.1f} ms, '
+              f'p95 {percentile(latencies, 0.95):.1f} ms, p99 {percentile(latencies, 0.99):.1f} ms')
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--processes', type=int, default=4, help='worker processes')
+    parser.add_argument('--readers', type=int, default=4, help='reader threads per process')
+    parser.add_argument('--duration', type=float, default=10, help='seconds per run')
+    parser.add_argument('--jobs', type=int, default=500, help='jobs seeded before the run')
+    args = parser.parse_args()
+
+    for production in (False, True):
+        run(production, args)
+
+
+if __name__ == '__main__':
+    main()
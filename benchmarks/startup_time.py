@@ -0,0 +1,104 @@
+"""Startup benchmark for the pre-fork warm start in wsgi.py against cold workers.
+
+    python benchmarks/startup_time.py --runs 5
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+STARTED = time.perf_counter()
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+PATHS = ['/', '/jobs', '/jobs/1', '/jobs/search?q=Engineer']
+
+
+def _ms(since):
+    return (time.perf_counter() - since) * 1000
+
+
+def _serve_first_requests(app, started):
+    client = app.test_client()
+    timings = {}
+    for path in PATHS:
+        request_started = time.perf_counter()
+        assert client.get(path).status_code == 200, path
+        timings[path] = _ms(request_started)
+        timings.setdefault('to_first_response', _ms(started))
+    return timings
+
+
+def child_cold():
+    from app import create_app
+    app = create_app()
+    result = {'boot': _ms(STARTED)}
+    result.update(_serve_first_requests(app, STARTED))
+    print(json.dumps(result))
+
+
+def child_preload():
+    from wsgi import app, after_fork
+    result = {'boot': _ms(STARTED)}
+
+    read_end, write_end = os.pipe()
+    forked = time.perf_counter()
+    pid = os.fork()
+    if pid == 0:
+        os.close(read_end)
+        after_fork(app)
+        timings = _serve_first_requests(app, forked)
+        os.write(write_end, json.dumps(timings).encode())
+        os._exit(0)
+
+    os.close(write_end)
+    with os.fdopen(read_end) as pipe:
+        result.update(json.loads(pipe.read()))
+    os.waitpid(pid, 0)
+    print(json.dumps(result))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--runs', type=int, default=5, help='fresh processes per setup')
+    parser.add_argument('--jobs', type=int, default=200, help='jobs seeded before the runs')
+    parser.add_argument('--child', choices=['cold', 'preload'], help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child == 'cold':
+        return child_cold()
+    if args.child == 'preload':
+        return child_preload()
+
+    workdir = tempfile.mkdtemp(prefix='openjobs-bench-')
+    os.chdir(workdir)
+    os.environ.update(
+        SECRET_KEY='benchmark',
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        TASK_WORKER_THREADS='0',
+        RATELIMIT_ENABLED='0'
+    )
+    # Imported here so the timed child processes don't load it
+    import seed_data
+    from app import create_app
+    seed_data.seed_jobs(create_app(), args.jobs)
+
+    # cold: each worker builds the app itself; preload: workers fork from a master that built and warmed it
+    for setup in ('cold', 'preload'):
+        runs = [
+            json.loads(subprocess.check_output([sys.executable, os.path.abspath(__file__), '--child', setup]))
+            for _ in range(args.runs)
+        ]
+        print(f'{setup} (median of {args.runs}):')
+        print(f"  app boot                        {statistics.median(r['boot'] for r in runs):8.1f} ms")
+        print(f"  worker start to first response  {statistics.median(r['to_first_response'] for r in runs):8.1f} ms")
+        for path in PATHS:
+            print(f"  first GET {path:<24}  {statistics.median(r[path] for r in runs):8.1f} ms")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,122 @@
+"""Render-time benchmark for the production template mode and bytecode cache.
+
+    python benchmarks/template_render.py --renders 200
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, ROOT)
+
+import seed_data
+
+PAGES = ['/', '/dashboard', '/jobs', '/jobs/1', '/jobs/search?q=Engineer', '/admin/', '/admin/jobs', '/admin/users']
+
+
+def _create_app(cache_dir, auto_reload):
+    os.environ['TEMPLATE_CACHE_DIR'] = cache_dir
+    os.environ['TEMPLATES_AUTO_RELOAD'] = '1' if auto_reload else ''
+    from app import create_app
+    return create_app()
+
+
+def capture_contexts():
+    """Request every page once and record the context each template was rendered with."""
+    from flask import before_render_template
+    from flask_login import current_user
+    app = _create_app('', False)
+    captured = []
+
+    def record(sender, template, context, **extra):
+        context = dict(context, current_user=current_user._get_current_object())
+        captured.append((template.name, context))
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = '1'
+        session['_fresh'] = True
+        session['admin_authenticated'] = True
+    with before_render_template.connected_to(record, app):
+        for page in PAGES:
+            assert client.get(page).status_code == 200, page
+    return captured
+
+
+def child(setup, cache_dir, renders):
+    from flask import render_template
+    contexts = capture_contexts()
+    app = _create_app(cache_dir, setup == 'reload')
+
+    results = {}
+    with app.test_request_context():
+        for name, context in contexts:
+            started = time.perf_counter()
+            render_template(name, **context)
+            first = (time.perf_counter() - started) * 1000
+
+            timings = []
+            for _ in range(renders):
+                started = time.perf_counter()
+                render_template(name, **context)
+                timings.append((time.perf_counter() - started) * 1000)
+            results[name] = {'first': first, 'p50': statistics.median(timings)}
+    print(json.dumps(results))
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--renders', type=int, default=200, help='renders per template after the first')
+    parser.add_argument('--jobs', type=int, default=100, help='jobs seeded before the runs')
+    parser.add_argument('--child', choices=['reload', 'cold cache', 'warm cache'], help=argparse.SUPPRESS)
+    parser.add_argument('--cache-dir', help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.child:
+        return child(args.child, args.cache_dir, args.renders)
+
+    workdir = tempfile.mkdtemp(prefix='openjobs-bench-')
+    os.chdir(workdir)
+    os.environ.update(
+        SECRET_KEY='benchmark',
+        DATABASE_URL=f"sqlite:///{os.path.join(workdir, 'bench.db')}",
+        TASK_WORKER_THREADS='0',
+        RATELIMIT_ENABLED='0'
+    )
+    from app import create_app
+    seed_data.seed_jobs(create_app(), args.jobs)
+
+    cache_dir = os.path.join(workdir, 'jinja_cache')
+    results = {}
+    # reload: auto-reload on, no bytecode cache; cold cache: auto-reload off, empty cache;
+    # warm cache: auto-reload off, cache filled by `flask compile-templates`
+    for setup in ('reload', 'cold cache', 'warm cache'):
+        if setup == 'warm cache':
+            subprocess.check_call(['flask', '--app', os.path.join(ROOT, 'app.py'), 'compile-templates'],
+                                  env=dict(os.environ, TEMPLATE_CACHE_DIR=cache_dir))
+        output = subprocess.check_output([
+            sys.executable, os.path.abspath(__file__), '--child', setup,
+            '--cache-dir', '' if setup == 'reload' else cache_dir, '--renders', str(args.renders)
+        ])
+        results[setup] = json.loads(output)
+        if setup == 'cold cache':
+            # Start the warm run from a cache filled only by the compile command
+            for entry in os.listdir(cache_dir):
+                os.remove(os.path.join(cache_dir, entry))
+
+    setups = list(results)
+    print(f"{'template':<24}" + ''.join(f'{s + " first":>18}' for s in setups) + ''.join(f'{s + " p50":>16}' for s in setups))
+    for name in results['reload']:
+        row = f'{name:<24}'
+        row += ''.join(f"{results[s][name]['first']:>15.2f} ms" for s in setups)
+        row += ''.join(f"{results[s][name]['p50']:>13.3f} ms" for s in setups)
+        print(row)
+
+
+if __name__ == '__main__':
+    main()
@@ -1,48 +1,150 @@
 import click
+import os
+import subprocess
+import time
+from flask import current_app
 from flask.cli import with_appcontext
-from models import db, User
-from app import create_app, bcrypt
+from sqlalchemy import func, select, update
+from models import db, User, Job, Application
+from app import bcrypt
+from alerts import send_alert_digests
+from tasks import start_worker, task_stats
+from templating import compile_templates
+from static_assets import build_assets
+from prerender import prerender_all
 
 @click.command('init-db')
 @with_appcontext
 def init_db_command():
     """Initialize the database with modern schema."""
-    app = create_app()
-    with app.app_context():
-        # Drop all tables first to ensure clean state
-        db.drop_all()
-        # Create all tables with new schema
-        db.create_all()
-        click.echo('✨ Database initialized successfully with modern schema!')
+    # Drop all tables first to ensure clean state
+    db.drop_all()
+    # Create all tables with new schema
+    db.create_all()
+    click.echo('✨ Database initialized successfully with modern schema!')
 
 @click.command('create-admin')
 @click.option('--username', prompt=True, help='Admin username')
 @click.option('--email', prompt=True, help='Admin email')
 @click.option('--password', prompt=True, hide_input=True, confirmation_prompt=True, help='Admin password')
+@with_appcontext
 def create_admin_command(username, email, password):
     """Create an admin user with enhanced privileges."""
-    app = create_app()
-    with app.app_context():
-        # Check if admin already exists
-        if User.query.filter_by(is_admin=True).first():
-            click.echo('❌ An admin user already exists!')
-            return
-
-        # Create admin user with modern details
-        hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
-        admin = User(
-            username=username,
-            email=email,
-            password=hashed_password,
-            is_admin=True,
-            name='Admin User',
-            is_active=True
+    # Check if admin already exists
+    if User.query.filter_by(is_admin=True).first():
+        click.echo('❌ An admin user already exists!')
+        return
+
+    # Create admin user with modern details
+    hashed_password = bcrypt.generate_password_hash(password).decode('utf-8')
+    admin = User(
+        username=username,
+        email=email,
+        password=hashed_password,
+        is_admin=True,
+        name='Admin User',
+        is_active=True
+    )
+
+    try:
+        db.session.add(admin)
+        db.session.commit()
+        click.echo('✨ Admin user created successfully with premium access!')
+    except Exception as e:
+        db.session.rollback()
+        click.echo(f'❌ Error creating admin user: {str(e)}')
+
+@click.command('send-alert-digests')
+@with_appcontext
+def send_alert_digests_command():
+    """Send one digest per user for job alerts matched since the last run."""
+    digests = send_alert_digests()
+    click.echo(f'✨ Sent {digests} job alert digest(s).')
+
+@click.command('worker')
+@click.option('--concurrency', default=4, show_default=True, help='Number of worker threads')
+@with_appcontext
+def worker_command(concurrency):
+    """Run background tasks until interrupted."""
+    worker = start_worker(current_app._get_current_object(), concurrency)
+    click.echo(f'✨ Task worker running with {concurrency} thread(s). Press Ctrl+C to stop.')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo('Stopping task worker...')
+        worker.stop()
+
+@click.command('task-stats')
+@with_appcontext
+def task_stats_command():
+    """Show background task counts and latencies for the last 24 hours."""
+    stats = task_stats()
+    if not stats:
+        click.echo('No tasks in the last 24 hours.')
+        return
+
+    def ms(value):
+        return '-' if value is None else f'{value:.0f}ms'
+
+    for name, entry in sorted(stats.items()):
+        click.echo(
+            f"{name}: {entry['done']} done, {entry['failed']} failed, "
+            f"{entry['queued']} queued, {entry['running']} running | "
+            f"wait p50 {ms(entry['wait_p50_ms'])} p95 {ms(entry['wait_p95_ms'])} | "
+            f"run p50 {ms(entry['run_p50_ms'])} p95 {ms(entry['run_p95_ms'])}"
+        )
+
+@click.command('reconcile-application-counts')
+@with_appcontext
+def reconcile_application_counts_command():
+    """Reset every job's applications_count from the application table."""
+    counts = select(func.count(Application.id)).where(Application.job_id == Job.id).scalar_subquery()
+    updated = db.session.execute(update(Job).values(applications_count=counts)).rowcount
+    db.session.commit()
+    click.echo(f'✨ Reconciled application counts for {updated} job(s).')
+
+@click.command('compile-templates')
+@with_appcontext
+def compile_templates_command():
+    """Precompile all templates into the shared bytecode cache."""
+    if current_app.jinja_env.bytecode_cache is None:
+        click.echo('❌ TEMPLATE_CACHE_DIR is not set; there is no bytecode cache to fill.')
+        return
+    started = time.perf_counter()
+    names = compile_templates(current_app)
+    click.echo(f'✨ Compiled {len(names)} template(s) into {current_app.config["TEMPLATE_CACHE_DIR"]} '
+               f'in {(time.perf_counter() - started) * 1000:.0f} ms.')
+
+@click.command('build-assets')
+@with_appcontext
+def build_assets_command():
+    """Build the CSS/JS bundles with content-hashed, precompressed files."""
+    try:
+        manifest = build_assets(current_app)
+    except (OSError, subprocess.CalledProcessError) as e:
+        # A deploy step: fail the script instead of silently shipping CDN fallback pages
+        raise click.ClickException(f'Asset build failed: {e}. Did you run `npm install`?')
+
+    build_dir = current_app.config['ASSETS_BUILD_DIR']
+    for name, hashed_name in manifest.items():
+        path = os.path.join(build_dir, hashed_name)
+        sizes = ', '.join(
+            f'{label} {os.path.getsize(path + suffix) / 1024:.1f} KB'
+            for label, suffix in (('raw', ''), ('gzip', '.gz'), ('brotli', '.br'))
+            if os.path.exists(path + suffix)
         )
+        click.echo(f'✨ {name} -> {hashed_name} ({sizes})')
 
-        try:
-            db.session.add(admin)
-            db.session.commit()
-            click.echo('✨ Admin user created successfully with premium access!')
-        except Exception as e:
-            db.session.rollback()
-            click.echo(f'❌ Error creating admin user: {str(e)}')
+@click.command('prerender')
+@click.option('--processes', type=int, default=None, help='Worker processes (default: one per CPU)')
+@with_appcontext
+def prerender_command(processes):
+    """Render static pages for every active job and the job board."""
+    if not current_app.config['PRERENDER_DIR']:
+        click.echo('❌ PRERENDER_DIR is not set.')
+        return
+    started = time.perf_counter()
+    written = prerender_all(current_app, processes)
+    click.echo(f'✨ Pre-rendered {written} job page(s) into {current_app.config["PRERENDER_DIR"]} '
+               f'in {time.perf_counter() - started:.1f}s.')
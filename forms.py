@@ -1,5 +1,6 @@
 from flask_wtf import FlaskForm
-from wtforms import StringField, PasswordField, SubmitField, TextAreaField, SelectField, DateField
+from flask_wtf.file import FileField, FileRequired, FileAllowed
+from wtforms import StringField, PasswordField, SubmitField, TextAreaField, SelectField, DateField, HiddenField
 from wtforms.validators import InputRequired, Length, ValidationError, Email, Regexp
 from models import User
 
@@ -109,3 +110,36 @@ class JobForm(FlaskForm):
                                       "class": "form-textarea",
                                       "rows": "4"})
     submit = SubmitField('Create Job Listing', render_kw={"class": "submit-btn"})
+
+class ApplicationForm(FlaskForm):
+    name = StringField('Full Name',
+                      validators=[InputRequired(), Length(min=2, max=100)],
+                      render_kw={"placeholder": "Enter your full name",
+                                "class": "form-input"})
+    email = StringField('Email Address',
+                       validators=[InputRequired(), Email(), Length(max=120)],
+                       render_kw={"placeholder": "Enter your email",
+                                 "class": "form-input"})
+    phone = StringField('Phone Number',
+                       validators=[Length(max=30)],
+                       render_kw={"placeholder": "Enter your phone number",
+                                 "class": "form-input"})
+    cover_letter = TextAreaField('Cover Letter',
+                                validators=[Length(max=5000)],
+                                render_kw={"placeholder": "Tell us why you're interested in this position...",
+                                          "class": "form-textarea",
+                                          "rows": "6"})
+    resume = FileField('Resume/CV',
+                      validators=[FileRequired(), FileAllowed(['pdf', 'doc', 'docx'], 'Accepted formats: PDF, DOC, DOCX')],
+                      render_kw={"accept": ".pdf,.doc,.docx",
+                                "class": "form-input"})
+    submit = SubmitField('Submit Application', render_kw={"class": "submit-btn"})
+
+class SaveSearchForm(FlaskForm):
+    q = HiddenField()
+    location = HiddenField()
+    type = HiddenField()
+    experience = HiddenField()
+
+class DeleteSearchForm(FlaskForm):
+    pass
@@ -0,0 +1,10 @@
+import os
+
+preload_app = True
+workers = int(os.getenv('WEB_CONCURRENCY', '4'))
+threads = int(os.getenv('GUNICORN_THREADS', '4'))
+
+
+def post_fork(server, worker):
+    from wsgi import app, after_fork
+    after_fork(app)
@@ -1,20 +1,63 @@
-from flask import Blueprint, render_template, request, flash, redirect, url_for
+from flask import Blueprint, Request, render_template, request, flash, redirect, url_for, current_app, send_from_directory, abort
 from flask_login import login_required, current_user
 from datetime import datetime
-from models import db, Job
-from forms import JobForm
+from sqlalchemy import func, update
+from sqlalchemy.exc import IntegrityError
+from werkzeug.utils import secure_filename
+import io
+import os
+import tempfile
+import uuid
+from models import db, Job, Application, job_cards
+from forms import JobForm, ApplicationForm, SaveSearchForm
+from alerts import queue_job_match
+from prerender import queue_prerender
+from tasks import task, enqueue
+from ratelimit import limiter
+
+# Allowance for the non-file form fields on top of the résumé itself
+FORM_OVERHEAD = 64 * 1024
 
 # Create Blueprint for jobs
 jobs = Blueprint('jobs', __name__)
 
+def active_job_cards():
+    """Job cards for active listings, newest first"""
+    return job_cards().filter(
+        Job.status == 'active',
+        Job.is_deleted.is_(False)
+    ).order_by(Job.created_at.desc())
+
+def search_job_cards(query='', location='', job_type='', experience=''):
+    """Job cards matching the search form criteria, newest first"""
+    jobs_query = job_cards().filter(Job.status == 'active')
+
+    if query:
+        jobs_query = jobs_query.filter(
+            db.or_(
+                Job.title.ilike(f'%{query}%'),
+                Job.company.ilike(f'%{query}%'),
+                Job.description.ilike(f'%{query}%'),
+                Job.skills.ilike(f'%{query}%')
+            )
+        )
+
+    if location:
+        jobs_query = jobs_query.filter(Job.location.ilike(f'%{location}%'))
+
+    if job_type:
+        jobs_query = jobs_query.filter(Job.job_type == job_type)
+
+    if experience:
+        jobs_query = jobs_query.filter(Job.experience_level == experience)
+
+    return jobs_query.order_by(Job.created_at.desc())
+
 @jobs.route('/jobs')
 def job_board():
     """Display all active job listings"""
     page = request.args.get('page', 1, type=int)
-    jobs = Job.query.filter_by(
-        status='active',
-        is_deleted=False
-    ).order_by(Job.created_at.desc()).paginate(page=page, per_page=10)
+    jobs = active_job_cards().paginate(page=page, per_page=10)
     return render_template('jobs/board.html', jobs=jobs)
 
 @jobs.route('/jobs/create', methods=['GET', 'POST'])
@@ -43,6 +86,8 @@ def create_job():
         )
         
         db.session.add(job)
+        queue_job_match(job)
+        queue_prerender(job)
         db.session.commit()
         flash('Job listing created successfully!', 'success')
         return redirect(url_for('jobs.job_board'))
@@ -78,6 +123,7 @@ def edit_job(job_id):
         job.skills = request.form.get('skills')
         job.deadline = datetime.strptime(request.form.get('deadline'), '%Y-%m-%d')
         
+        queue_prerender(job)
         db.session.commit()
         flash('Job listing updated successfully!', 'success')
         return redirect(url_for('jobs.view_job', job_id=job.id))
@@ -95,12 +141,17 @@ def delete_job(job_id):
         flash('You do not have permission to delete this job listing.', 'error')
         return redirect(url_for('jobs.job_board'))
     
+    resumes = [path for (path,) in job.applications.with_entities(Application.resume_path)]
+    queue_prerender(job)
     db.session.delete(job)
+    if resumes:
+        enqueue('jobs.delete_resumes', paths=resumes)
     db.session.commit()
     flash('Job listing deleted successfully!', 'success')
     return redirect(url_for('jobs.job_board'))
 
 @jobs.route('/jobs/search')
+@limiter.limit('60/hour')
 def search_jobs():
     """Search for jobs based on various criteria"""
     query = request.args.get('q', '')
@@ -108,29 +159,187 @@ def search_jobs():
     job_type = request.args.get('type', '')
     experience = request.args.get('experience', '')
     
-    jobs_query = Job.query.filter_by(status='active')
-    
-    if query:
-        jobs_query = jobs_query.filter(
-            db.or_(
-                Job.title.ilike(f'%{query}%'),
-                Job.company.ilike(f'%{query}%'),
-                Job.description.ilike(f'%{query}%'),
-                Job.skills.ilike(f'%{query}%')
-            )
-        )
-    
-    if location:
-        jobs_query = jobs_query.filter(Job.location.ilike(f'%{location}%'))
-    
-    if job_type:
-        jobs_query = jobs_query.filter(Job.job_type == job_type)
-    
-    if experience:
-        jobs_query = jobs_query.filter(Job.experience_level == experience)
-    
     page = request.args.get('page', 1, type=int)
-    jobs = jobs_query.order_by(Job.created_at.desc()).paginate(page=page, per_page=10)
+    jobs = search_job_cards(query, location, job_type, experience).paginate(page=page, per_page=10)
     
+    # Only signed-in users can save a search; don't start a session for anyone else
+    save_form = None
+    if current_user.is_authenticated:
+        save_form = SaveSearchForm(q=query, location=location, type=job_type, experience=experience)
     return render_template('jobs/search.html', jobs=jobs, query=query, location=location,
-                         job_type=job_type, experience=experience)
+                         job_type=job_type, experience=experience, save_form=save_form)
+
+class ResumeTooLarge(Exception):
+    pass
+
+class ResumeUpload(io.FileIO):
+    """Uploaded file part written straight into RESUME_UPLOAD_FOLDER as it is parsed.
+
+    Bytes past the size limit are dropped and flagged instead of raising mid-parse,
+    so the view can answer with a form error.
+    """
+
+    def __init__(self, folder, limit):
+        os.makedirs(folder, exist_ok=True)
+        fd, self.path = tempfile.mkstemp(dir=folder, suffix='.part')
+        super().__init__(fd, 'r+b')
+        self.limit = limit
+        self.size = 0
+
+    @property
+    def too_large(self):
+        return self.size > self.limit
+
+    def write(self, data):
+        self.size += len(data)
+        if self.too_large:
+            return len(data)
+        return super().write(data)
+
+    def discard(self):
+        self.close()
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+class UploadRequest(Request):
+    """Request that streams résumé uploads to disk instead of spooling them to a temporary file first"""
+
+    def _get_file_stream(self, total_content_length, content_type, filename=None, content_length=None):
+        if self.endpoint != 'jobs.apply_to_job':
+            return super()._get_file_stream(total_content_length, content_type, filename, content_length)
+        upload = ResumeUpload(current_app.config['RESUME_UPLOAD_FOLDER'], current_app.config['MAX_RESUME_SIZE'])
+        self.__dict__.setdefault('resume_uploads', []).append(upload)
+        return upload
+
+    def close(self):
+        super().close()
+        # Remove any upload the view did not move into place
+        for upload in self.__dict__.pop('resume_uploads', ()):
+            upload.discard()
+
+def _save_resume(storage):
+    """Move a streamed résumé into place under a fresh name; returns the stored name and size"""
+    upload = storage.stream
+    if upload.too_large:
+        raise ResumeTooLarge()
+    upload.close()
+
+    extension = os.path.splitext(secure_filename(storage.filename))[1].lower()
+    stored_name = f'{uuid.uuid4().hex}{extension}'
+    os.replace(upload.path, os.path.join(current_app.config['RESUME_UPLOAD_FOLDER'], stored_name))
+    return stored_name, upload.size
+
+def _remove_resume(stored_name):
+    path = os.path.join(current_app.config['RESUME_UPLOAD_FOLDER'], stored_name)
+    if os.path.exists(path):
+        os.remove(path)
+
+@task('jobs.delete_resumes')
+def delete_resumes(paths):
+    """Remove résumé files belonging to a deleted job"""
+    for stored_name in paths:
+        _remove_resume(stored_name)
+
+@jobs.route('/jobs/<int:job_id>/apply', methods=['GET', 'POST'])
+@login_required
+def apply_to_job(job_id):
+    """Apply to a job listing with a résumé upload"""
+    job = Job.query.get_or_404(job_id)
+
+    if job.status != 'active' or job.is_deleted:
+        flash('This job is no longer accepting applications.', 'error')
+        return redirect(url_for('jobs.view_job', job_id=job.id))
+
+    if job.user_id == current_user.id:
+        flash('You cannot apply to your own job listing.', 'error')
+        return redirect(url_for('jobs.view_job', job_id=job.id))
+
+    if Application.query.filter_by(job_id=job.id, user_id=current_user.id).first():
+        flash('You have already applied to this job.', 'info')
+        return redirect(url_for('jobs.view_job', job_id=job.id))
+
+    # Reject oversized uploads from the Content-Length header, before the body is read
+    if request.method == 'POST':
+        max_size = current_app.config['MAX_RESUME_SIZE'] + FORM_OVERHEAD
+        if request.content_length is None or request.content_length > max_size:
+            flash(f'Your résumé must be smaller than {current_app.config["MAX_RESUME_SIZE"] // (1024 * 1024)}MB.', 'error')
+            return redirect(url_for('jobs.apply_to_job', job_id=job.id))
+
+    form = ApplicationForm()
+    if request.method == 'GET':
+        form.name.data = current_user.name
+        form.email.data = current_user.email
+
+    if form.validate_on_submit():
+        try:
+            stored_name, size = _save_resume(form.resume.data)
+        except ResumeTooLarge:
+            flash(f'Your résumé must be smaller than {current_app.config["MAX_RESUME_SIZE"] // (1024 * 1024)}MB.', 'error')
+            return redirect(url_for('jobs.apply_to_job', job_id=job.id))
+
+        application = Application(
+            job_id=job.id,
+            user_id=current_user.id,
+            name=form.name.data,
+            email=form.email.data,
+            phone=form.phone.data,
+            cover_letter=form.cover_letter.data,
+            resume_filename=secure_filename(form.resume.data.filename) or stored_name,
+            resume_path=stored_name,
+            resume_size=size
+        )
+        db.session.add(application)
+        # Increment in SQL so concurrent applications never lose an update
+        db.session.execute(
+            update(Job)
+            .where(Job.id == job.id)
+            .values(applications_count=func.coalesce(Job.applications_count, 0) + 1)
+        )
+        try:
+            db.session.commit()
+        except IntegrityError:
+            # A concurrent request from the same user got there first
+            db.session.rollback()
+            _remove_resume(stored_name)
+            flash('You have already applied to this job.', 'info')
+            return redirect(url_for('jobs.view_job', job_id=job.id))
+        except Exception:
+            db.session.rollback()
+            _remove_resume(stored_name)
+            raise
+
+        flash('Application submitted successfully!', 'success')
+        return redirect(url_for('jobs.view_job', job_id=job.id))
+
+    return render_template('jobs/apply.html', form=form, job=job)
+
+@jobs.route('/jobs/<int:job_id>/applicants')
+@login_required
+def view_applicants(job_id):
+    """List applications for a job listing"""
+    job = Job.query.get_or_404(job_id)
+
+    # Ensure only the job creator can see applicants
+    if job.user_id != current_user.id:
+        flash('You do not have permission to view applicants for this job listing.', 'error')
+        return redirect(url_for('jobs.job_board'))
+
+    page = request.args.get('page', 1, type=int)
+    applications = job.applications.order_by(Application.created_at.desc()).paginate(page=page, per_page=20)
+    return render_template('jobs/applicants.html', job=job, applications=applications)
+
+@jobs.route('/jobs/<int:job_id>/applicants/<int:application_id>/resume')
+@login_required
+def download_resume(job_id, application_id):
+    """Download an applicant's résumé"""
+    application = Application.query.filter_by(id=application_id, job_id=job_id).first_or_404()
+
+    if application.job.user_id != current_user.id:
+        abort(404)
+
+    return send_from_directory(
+        current_app.config['RESUME_UPLOAD_FOLDER'],
+        application.resume_path,
+        as_attachment=True,
+        download_name=application.resume_filename
+    )
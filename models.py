@@ -1,6 +1,7 @@
 from flask_login import UserMixin
 from datetime import datetime
 from flask_sqlalchemy import SQLAlchemy
+from flask_sqlalchemy.pagination import Pagination
 
 db = SQLAlchemy()
 
@@ -22,6 +23,17 @@ class User(db.Model, UserMixin):
 
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy import Index
+from sqlalchemy.orm import validates
+
+EXCERPT_LENGTH = 300
+
+
+def make_excerpt(text, length=EXCERPT_LENGTH):
+    """Return a whitespace-collapsed excerpt of text for job cards"""
+    text = ' '.join((text or '').split())
+    if len(text) <= length:
+        return text
+    return text[:length - 1].rsplit(' ', 1)[0] + '…'
 
 class Job(db.Model):
     """Job model for managing job listings with modern features"""
@@ -31,6 +43,7 @@ class Job(db.Model):
     company = db.Column(db.String(100), nullable=False)
     location = db.Column(db.String(100), nullable=False)
     description = db.Column(db.Text, nullable=False)
+    excerpt = db.Column(db.String(EXCERPT_LENGTH))  # Short description for list pages, kept in sync on write
     requirements = db.Column(db.Text, nullable=False)
     salary_range = db.Column(db.String(50))
     job_type = db.Column(db.String(50), nullable=False)  # Full-time, Part-time, Contract
@@ -45,8 +58,129 @@ class Job(db.Model):
     views_count = db.Column(db.Integer, default=0)
     applications_count = db.Column(db.Integer, default=0)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    # Relationships
+    applications = db.relationship('Application', backref='job', lazy='dynamic', cascade='all, delete-orphan')
     
+    @validates('description')
+    def _sync_excerpt(self, key, description):
+        self.excerpt = make_excerpt(description)
+        return description
+
     def __repr__(self):
         return f"Job('{self.title}' at '{self.company}')"
 
 
+class Application(db.Model):
+    """A candidate's application to a job listing"""
+    id = db.Column(db.Integer, primary_key=True)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    name = db.Column(db.String(100), nullable=False)
+    email = db.Column(db.String(120), nullable=False)
+    phone = db.Column(db.String(30))
+    cover_letter = db.Column(db.Text)
+    resume_filename = db.Column(db.String(255), nullable=False)  # Original name, for downloads
+    resume_path = db.Column(db.String(255), nullable=False)  # Stored name inside RESUME_UPLOAD_FOLDER
+    resume_size = db.Column(db.Integer, nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Relationships
+    applicant = db.relationship('User', backref=db.backref('applications', lazy=True, cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.UniqueConstraint('job_id', 'user_id', name='uq_application_job_user'),
+        Index('ix_application_job_created', 'job_id', 'created_at'),
+    )
+
+    def __repr__(self):
+        return f"Application('{self.name}' for job {self.job_id})"
+
+
+# Columns rendered by the job card templates; the Text columns stay in the database
+JOB_CARD_COLUMNS = (
+    Job.id, Job.title, Job.company, Job.location, Job.salary_range, Job.job_type,
+    Job.experience_level, Job.remote_option, Job.skills, Job.excerpt, Job.status,
+    Job.views_count, Job.applications_count, Job.created_at, Job.user_id
+)
+
+
+def job_cards(*extra_columns):
+    """Query for list pages returning plain named-tuple rows instead of Job objects.
+
+    Rows are not added to the session's identity map and never load the
+    description, requirements or benefits columns.
+    """
+    return db.session.query(*JOB_CARD_COLUMNS, *extra_columns)
+
+
+class PrefetchedPagination(Pagination):
+    """Pagination over a page of items and a total that were fetched beforehand."""
+
+    def _query_items(self):
+        return self._query_args['items']
+
+    def _query_count(self):
+        return self._query_args['total']
+
+
+class SavedSearch(db.Model):
+    """Saved job search criteria used for new-posting alerts"""
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False, index=True)
+    keywords = db.Column(db.String(200))
+    location = db.Column(db.String(100))
+    job_type = db.Column(db.String(50))
+    experience_level = db.Column(db.String(50))
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    # Relationships
+    user = db.relationship('User', backref=db.backref('saved_searches', lazy=True, cascade='all, delete-orphan'))
+    alerts = db.relationship('JobAlert', backref='saved_search', lazy=True, cascade='all, delete-orphan')
+
+    # Never reuse the id of a deleted search: other processes' percolator indexes
+    # would otherwise attribute the old criteria to the new search
+    __table_args__ = {'sqlite_autoincrement': True}
+
+    def __repr__(self):
+        return f"SavedSearch('{self.keywords}' in '{self.location}')"
+
+
+class JobAlert(db.Model):
+    """A new job posting that matched a saved search, pending digest delivery"""
+    id = db.Column(db.Integer, primary_key=True)
+    saved_search_id = db.Column(db.Integer, db.ForeignKey('saved_search.id'), nullable=False)
+    job_id = db.Column(db.Integer, db.ForeignKey('job.id'), nullable=False)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    notified_at = db.Column(db.DateTime)
+    # Relationships
+    job = db.relationship('Job', backref=db.backref('alerts', lazy=True, cascade='all, delete-orphan'))
+
+    __table_args__ = (
+        db.UniqueConstraint('saved_search_id', 'job_id', name='uq_job_alert_search_job'),
+        Index('ix_job_alert_pending', 'user_id', 'notified_at'),
+    )
+
+    def __repr__(self):
+        return f"JobAlert(search={self.saved_search_id}, job={self.job_id})"
+
+
+class Task(db.Model):
+    """Durable background task, inserted in the same transaction as the change that needs it"""
+    id = db.Column(db.Integer, primary_key=True)
+    name = db.Column(db.String(100), nullable=False)
+    payload = db.Column(db.Text, nullable=False, default='{}')  # JSON-encoded keyword arguments
+    idempotency_key = db.Column(db.String(200), unique=True)
+    status = db.Column(db.String(20), nullable=False, default='queued')  # queued, running, done, failed
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    max_attempts = db.Column(db.Integer, nullable=False, default=5)
+    last_error = db.Column(db.Text)
+    created_at = db.Column(db.DateTime, default=datetime.utcnow)
+    run_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    started_at = db.Column(db.DateTime)
+    finished_at = db.Column(db.DateTime)
+
+    __table_args__ = (
+        Index('ix_task_status_run_at', 'status', 'run_at'),
+    )
+
+    def __repr__(self):
+        return f"Task('{self.name}', '{self.status}')"
@@ -0,0 +1,127 @@
+import math
+import os
+from concurrent.futures import ProcessPoolExecutor
+from flask import current_app, render_template
+from models import db, Job, PrefetchedPagination
+from static_assets import write_atomic
+from tasks import task, enqueue
+
+BOARD_PER_PAGE = 10
+
+
+def _path(app, *parts):
+    return os.path.join(app.config['PRERENDER_DIR'], *parts)
+
+
+def _render(app, path, template, **context):
+    # A fresh app context keeps g, and with it the anonymous user, per page
+    with app.app_context(), app.test_request_context(path, base_url=app.config['PRERENDER_BASE_URL']):
+        return render_template(template, **context).encode()
+
+
+def _remove(path):
+    if os.path.exists(path):
+        os.remove(path)
+
+
+def _is_published(job):
+    return job is not None and job.status == 'active' and not job.is_deleted
+
+
+def render_jobs(app, jobs):
+    """Write the detail page of each active job in jobs."""
+    os.makedirs(_path(app, 'jobs'), exist_ok=True)
+    for job in jobs:
+        html = _render(app, f'/jobs/{job.id}', 'jobs/view.html', job=job)
+        write_atomic(_path(app, 'jobs', f'{job.id}.html'), html)
+
+
+def render_job(app, job_id):
+    """Write or remove the detail page of one job, depending on whether it is active."""
+    job = db.session.get(Job, job_id)
+    if _is_published(job):
+        render_jobs(app, [job])
+    else:
+        _remove(_path(app, 'jobs', f'{job_id}.html'))
+
+
+def render_board(app):
+    """Write the first PRERENDER_BOARD_PAGES job board pages and remove any beyond the end."""
+    from jobs import active_job_cards
+
+    os.makedirs(_path(app, 'board'), exist_ok=True)
+    total = active_job_cards().order_by(None).count()
+    pages = min(max(1, math.ceil(total / BOARD_PER_PAGE)), app.config['PRERENDER_BOARD_PAGES'])
+    for page in range(1, pages + 1):
+        items = active_job_cards().limit(BOARD_PER_PAGE).offset((page - 1) * BOARD_PER_PAGE).all()
+        jobs = PrefetchedPagination(page=page, per_page=BOARD_PER_PAGE, error_out=False, items=items, total=total)
+        # Rendered as /jobs without a query string; the pagination links carry ?page=
+        html = _render(app, '/jobs', 'jobs/board.html', jobs=jobs)
+        write_atomic(_path(app, 'board', f'{page}.html'), html)
+
+    for name in os.listdir(_path(app, 'board')):
+        stem, extension = os.path.splitext(name)
+        if extension == '.html' and stem.isdigit() and int(stem) > pages:
+            os.remove(_path(app, 'board', name))
+
+
+@task('prerender.job')
+def prerender_job(job_id):
+    """Re-render a changed job's page and the job board"""
+    if not current_app.config['PRERENDER_DIR']:
+        return
+    render_job(current_app, job_id)
+    render_board(current_app)
+
+
+def queue_prerender(job):
+    """Queue re-rendering after a change to job; call before committing the change"""
+    if current_app.config['PRERENDER_DIR']:
+        db.session.flush()
+        enqueue('prerender.job', job_id=job.id)
+
+
+_worker_app = None
+
+
+def _init_worker():
+    global _worker_app
+    from app import create_app
+    _worker_app = create_app()
+
+
+def _render_chunk(job_ids):
+    with _worker_app.app_context():
+        jobs = Job.query.filter(Job.id.in_(job_ids)).all()
+        render_jobs(_worker_app, jobs)
+        return len(jobs)
+
+
+def prerender_all(app, processes=None, chunk_size=200):
+    """Rebuild every page in a process pool; returns the number of job pages written."""
+    published = {
+        job_id for (job_id,) in db.session.query(Job.id).filter(
+            Job.status == 'active',
+            Job.is_deleted.is_(False)
+        )
+    }
+    # Close our connections so forked workers don't inherit them
+    db.session.close()
+    db.engine.dispose()
+    ids = sorted(published)
+    chunks = [ids[i:i + chunk_size] for i in range(0, len(ids), chunk_size)]
+
+    written = 0
+    if chunks:
+        with ProcessPoolExecutor(max_workers=processes, initializer=_init_worker) as pool:
+            written = sum(pool.map(_render_chunk, chunks))
+
+    # Drop pages of jobs that are no longer active
+    os.makedirs(_path(app, 'jobs'), exist_ok=True)
+    for name in os.listdir(_path(app, 'jobs')):
+        stem, extension = os.path.splitext(name)
+        if extension == '.html' and stem.isdigit() and int(stem) not in published:
+            os.remove(_path(app, 'jobs', name))
+
+    render_board(app)
+    return written
@@ -0,0 +1,139 @@
+import math
+import os
+import random
+import re
+import sqlite3
+import threading
+import time
+from flask import request, current_app
+from werkzeug.exceptions import TooManyRequests
+
+_LIMIT = re.compile(r'^\s*(\d+)\s*(?:/|per)\s*(\d*)\s*(second|minute|hour|day)s?\s*$', re.IGNORECASE)
+_PERIODS = {'second': 1, 'minute': 60, 'hour': 3600, 'day': 86400}
+
+# Refill the bucket for the time elapsed, then take a token if one is available.
+# SQLite evaluates every SET expression against the old row, so tokens and
+# allowed see the same refill.
+_REFILL = 'min(:capacity, tokens + (:now - updated) * :rate)'
+_CHECK_SQL = f'''
+    INSERT INTO bucket (key, tokens, updated, allowed, expires)
+    VALUES (:key, :capacity - 1, :now, 1, :expires)
+    ON CONFLICT (key) DO UPDATE SET
+        tokens = CASE WHEN {_REFILL} >= 1 THEN {_REFILL} - 1 ELSE {_REFILL} END,
+        allowed = {_REFILL} >= 1,
+        updated = :now,
+        expires = :expires
+    RETURNING allowed, tokens
+'''
+
+
+def parse_limit(limit):
+    """Parse '100/hour' or '5 per minute' into (capacity, tokens per second)."""
+    match = _LIMIT.match(limit)
+    if not match:
+        raise ValueError(f'Invalid rate limit {limit!r}')
+    count, multiplier, unit = match.groups()
+    period = _PERIODS[unit.lower()] * int(multiplier or 1)
+    return int(count), int(count) / period
+
+
+class RateLimiter:
+    """Flask extension enforcing per-client, per-endpoint token buckets."""
+
+    def __init__(self, app=None):
+        self._local = threading.local()
+        self._overrides = {}
+        self._exempt = set()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('RATELIMIT_ENABLED', True)
+        app.config.setdefault('RATELIMIT_DEFAULT', '100/hour')
+        app.config.setdefault('RATELIMIT_STORAGE_PATH', os.path.join(app.instance_path, 'ratelimit.db'))
+        app.extensions['rate_limiter'] = self
+        app.before_request(self._check_request)
+
+    def limit(self, limit, methods=None):
+        """Decorator overriding the default limit for a view, optionally only for some methods."""
+        parse_limit(limit)
+
+        def decorator(f):
+            self._overrides[f'{f.__module__}.{f.__name__}'] = (limit, methods and {m.upper() for m in methods})
+            return f
+        return decorator
+
+    def exempt(self, f):
+        """Decorator excluding a view from rate limiting."""
+        self._exempt.add(f'{f.__module__}.{f.__name__}')
+        return f
+
+    def _connection(self):
+        # One connection per thread, reopened after a fork
+        conn = getattr(self._local, 'conn', None)
+        if conn is not None and self._local.pid == os.getpid():
+            return conn
+
+        path = current_app.config['RATELIMIT_STORAGE_PATH']
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        conn = sqlite3.connect(path, timeout=1, isolation_level=None, check_same_thread=False)
+        conn.execute('PRAGMA journal_mode=WAL')
+        conn.execute('PRAGMA synchronous=OFF')
+        conn.execute('''
+            CREATE TABLE IF NOT EXISTS bucket (
+                key TEXT PRIMARY KEY,
+                tokens REAL NOT NULL,
+                updated REAL NOT NULL,
+                allowed INTEGER NOT NULL,
+                expires REAL NOT NULL
+            )
+        ''')
+        conn.execute('CREATE INDEX IF NOT EXISTS ix_bucket_expires ON bucket (expires)')
+        self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def hit(self, key, limit):
+        """Take a token for key; return the seconds to wait, or 0 if allowed."""
+        capacity, rate = parse_limit(limit)
+        now = time.time()
+        conn = self._connection()
+        allowed, tokens = conn.execute(_CHECK_SQL, {
+            'key': key,
+            'capacity': capacity,
+            'rate': rate,
+            'now': now,
+            # A bucket that has refilled completely is indistinguishable from a new one
+            'expires': now + capacity / rate
+        }).fetchone()
+
+        if random.random() < 0.001:
+            conn.execute('DELETE FROM bucket WHERE expires < ?', (now,))
+
+        if allowed:
+            return 0
+        return max(1, math.ceil((1 - tokens) / rate))
+
+    def _check_request(self):
+        if not current_app.config['RATELIMIT_ENABLED'] or request.endpoint in (None, 'static'):
+            return
+
+        view = current_app.view_functions[request.endpoint]
+        name = f'{view.__module__}.{view.__name__}'
+        if name in self._exempt:
+            return
+
+        limit, methods = self._overrides.get(name, (current_app.config['RATELIMIT_DEFAULT'], None))
+        if methods and request.method not in methods:
+            limit = current_app.config['RATELIMIT_DEFAULT']
+
+        try:
+            retry_after = self.hit(f'{request.remote_addr}:{request.endpoint}:{limit}', limit)
+        except sqlite3.Error:
+            # A locked or unwritable store must not take the whole site down; fail open
+            current_app.logger.exception('Rate limit check failed for %s', request.endpoint)
+            return
+        if retry_after:
+            raise TooManyRequests(retry_after=retry_after)
+
+
+limiter = RateLimiter()
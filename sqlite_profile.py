@@ -0,0 +1,57 @@
+import re
+import sqlite3
+import threading
+from sqlalchemy import event
+
+DEFAULT_PRAGMAS = {
+    'journal_mode': 'WAL',
+    'busy_timeout': 5000,
+    'synchronous': 'NORMAL',
+    'mmap_size': 268435456,
+    'cache_size': -64000,
+    'temp_store': 'MEMORY'
+}
+
+_WRITE_STATEMENT = re.compile(r'^\s*(INSERT|UPDATE|DELETE|REPLACE|CREATE|DROP|ALTER)\b', re.IGNORECASE)
+
+# One writer per process at a time
+_writer_lock = threading.Lock()
+
+
+def _acquire_writer(conn, timeout):
+    if conn.info.get('sqlite_writer'):
+        return
+    if not _writer_lock.acquire(timeout=timeout):
+        raise sqlite3.OperationalError('database is locked (timed out waiting for the writer lock)')
+    conn.info['sqlite_writer'] = True
+
+
+def configure_sqlite(app, engine):
+    """Apply the SQLite production profile to engine if enabled for app."""
+    if engine.dialect.name != 'sqlite' or not app.config.get('SQLITE_PRODUCTION'):
+        return
+
+    pragmas = dict(DEFAULT_PRAGMAS, **app.config.get('SQLITE_PRAGMAS', {}))
+    if engine.url.database in (None, '', ':memory:'):
+        pragmas.pop('journal_mode', None)
+        pragmas.pop('mmap_size', None)
+    lock_timeout = pragmas.get('busy_timeout', 5000) / 1000
+
+    @event.listens_for(engine, 'connect')
+    def set_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f'PRAGMA {name}={value}')
+        cursor.close()
+
+    @event.listens_for(engine, 'before_cursor_execute')
+    def serialize_writes(conn, cursor, statement, parameters, context, executemany):
+        if _WRITE_STATEMENT.match(statement):
+            _acquire_writer(conn, lock_timeout)
+
+    # Sessions return their connection to the pool once the transaction has
+    # been committed or rolled back, which is when the writer lock is freed
+    @event.listens_for(engine, 'checkin')
+    def release_on_checkin(dbapi_connection, connection_record):
+        if connection_record.info.pop('sqlite_writer', False):
+            _writer_lock.release()
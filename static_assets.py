@@ -0,0 +1,154 @@
+import gzip
+import hashlib
+import json
+import mimetypes
+import os
+import shlex
+import subprocess
+import tempfile
+from flask import current_app, request, send_file, abort, url_for
+from werkzeug.security import safe_join
+from ratelimit import limiter
+
+ONE_YEAR = 365 * 24 * 3600
+
+# Preferred first
+ENCODINGS = (('br', '.br'), ('gzip', '.gz'))
+
+
+def write_atomic(path, data):
+    """Write bytes to path via a temporary file and a rename, so readers never see a partial file."""
+    fd, temp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix='.part')
+    try:
+        with os.fdopen(fd, 'wb') as out:
+            out.write(data)
+        # mkstemp creates owner-only files; a front proxy needs to read them
+        os.chmod(temp_path, 0o644)
+        os.replace(temp_path, path)
+    except BaseException:
+        os.remove(temp_path)
+        raise
+
+
+def _emit(build_dir, name, data, brotli=None):
+    """Write data under a content-hashed version of name, plus compressed variants."""
+    stem, extension = os.path.splitext(name)
+    hashed_name = f'{stem}.{hashlib.sha256(data).hexdigest()[:12]}{extension}'
+    path = os.path.join(build_dir, hashed_name)
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    if brotli is not None and not os.path.exists(path + '.br'):
+        write_atomic(path + '.br', brotli.compress(data, quality=11))
+    if not os.path.exists(path):
+        write_atomic(path + '.gz', gzip.compress(data, compresslevel=9, mtime=0))
+        write_atomic(path, data)
+    return hashed_name
+
+
+def build_assets(app):
+    """Build every bundle into ASSETS_BUILD_DIR and return the new manifest."""
+    source_dir = os.path.join(app.root_path, 'assets')
+    build_dir = app.config['ASSETS_BUILD_DIR']
+    os.makedirs(build_dir, exist_ok=True)
+    try:
+        import brotli
+    except ImportError:
+        app.logger.warning('Brotli is not installed (requirements-build.txt); skipping .br files')
+        brotli = None
+
+    with tempfile.TemporaryDirectory() as temp_dir:
+        css_path = os.path.join(temp_dir, 'app.css')
+        subprocess.run(
+            [*shlex.split(app.config['ASSETS_TAILWIND_COMMAND']),
+             '--input', os.path.join(source_dir, 'app.css'), '--output', css_path, '--minify'],
+            cwd=app.root_path, check=True
+        )
+        bundles = {
+            'css/app.css': css_path,
+            'js/basecoat.js': os.path.join(app.root_path, 'node_modules', 'basecoat-css', 'dist', 'js', 'all.min.js')
+        }
+
+        manifest = {}
+        for name, path in bundles.items():
+            with open(path, 'rb') as f:
+                manifest[name] = _emit(build_dir, name, f.read(), brotli)
+
+    # Files from earlier builds are kept for pages still referencing them
+    write_atomic(os.path.join(build_dir, 'manifest.json'), json.dumps(manifest, indent=2).encode())
+    app.extensions['static_assets'].reload()
+    return manifest
+
+
+class StaticAssets:
+    """Flask extension serving built assets and resolving them via the manifest."""
+
+    def __init__(self, app=None):
+        self._manifest = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        app.config.setdefault('ASSETS_BUILD_DIR', os.path.join(app.root_path, 'assets', 'dist'))
+        app.config.setdefault('ASSETS_TAILWIND_COMMAND', 'npx @tailwindcss/cli')
+        app.extensions['static_assets'] = self
+        app.add_url_rule('/assets/<path:filename>', 'asset', send_asset)
+        app.add_template_global(asset_url)
+        app.add_template_global(assets_built)
+
+    def reload(self):
+        self._manifest = None
+
+    @property
+    def manifest(self):
+        # Read once per process; debug mode picks up rebuilds without a restart
+        if self._manifest is None or current_app.debug:
+            path = os.path.join(current_app.config['ASSETS_BUILD_DIR'], 'manifest.json')
+            try:
+                with open(path) as f:
+                    manifest = json.load(f)
+            except FileNotFoundError:
+                manifest = {}
+            self._manifest = manifest
+        return self._manifest
+
+    def is_hashed(self, filename):
+        return filename in self.manifest.values()
+
+
+def assets_built():
+    """Whether `flask build-assets` has produced a manifest."""
+    return bool(current_app.extensions['static_assets'].manifest)
+
+
+def asset_url(name):
+    """URL of the built, content-hashed file for a logical asset name like 'css/app.css'."""
+    manifest = current_app.extensions['static_assets'].manifest
+    if name not in manifest:
+        raise LookupError(f'{name!r} is not in the asset manifest; run `flask build-assets`')
+    return url_for('asset', filename=manifest[name])
+
+
+@limiter.exempt
+def send_asset(filename):
+    """Serve a built asset, precompressed when the client accepts it."""
+    path = safe_join(current_app.config['ASSETS_BUILD_DIR'], filename)
+    if path is None or not os.path.isfile(path):
+        abort(404)
+
+    hashed = current_app.extensions['static_assets'].is_hashed(filename)
+    max_age = ONE_YEAR if hashed else None
+    mimetype = mimetypes.guess_type(filename)[0]
+    for encoding, suffix in ENCODINGS:
+        if request.accept_encodings.quality(encoding) and os.path.isfile(path + suffix):
+            response = send_file(path + suffix, mimetype=mimetype, max_age=max_age)
+            response.content_encoding = encoding
+            break
+    else:
+        response = send_file(path, mimetype=mimetype, max_age=max_age)
+
+    response.vary.add('Accept-Encoding')
+    if hashed:
+        response.cache_control.immutable = True
+    return response
+
+
+static_assets = StaticAssets()
@@ -0,0 +1,265 @@
+from flask import current_app
+from sqlalchemy import event, update
+from sqlalchemy.orm import Session
+from datetime import datetime, timedelta
+import json
+import random
+import threading
+import time
+from models import db, Task
+
+# Registered task handlers, keyed by task name
+_handlers = {}
+_start_lock = threading.Lock()
+
+
+def task(name):
+    """Decorator to register a function as the handler for a background task."""
+    def decorator(f):
+        _handlers[name] = f
+        return f
+    return decorator
+
+
+def enqueue(name, idempotency_key=None, delay=0, max_attempts=None, **payload):
+    """Queue a task as part of the current transaction.
+
+    The task row is only visible to workers once the caller commits, so work
+    is never started for a change that was rolled back. Tasks sharing an
+    idempotency key are only queued once.
+    """
+    if idempotency_key is not None:
+        pending = any(isinstance(obj, Task) and obj.idempotency_key == idempotency_key for obj in db.session.new)
+        if pending or db.session.query(Task.id).filter_by(idempotency_key=idempotency_key).first():
+            return None
+
+    task = Task(
+        name=name,
+        payload=json.dumps(payload),
+        idempotency_key=idempotency_key,
+        max_attempts=max_attempts or current_app.config['TASK_MAX_ATTEMPTS'],
+        run_at=datetime.utcnow() + timedelta(seconds=delay)
+    )
+    db.session.add(task)
+    db.session.info['tasks_enqueued'] = True
+    return task
+
+
+@event.listens_for(Session, 'after_commit')
+def _wake_workers(session):
+    """Wake the in-process workers once queued tasks are committed."""
+    if not session.info.pop('tasks_enqueued', False):
+        return
+    worker = current_app.extensions.get('task_worker')
+    if worker is not None:
+        worker.wake()
+
+
+@event.listens_for(Session, 'after_rollback')
+def _discard_wakeup(session):
+    session.info.pop('tasks_enqueued', None)
+
+
+def claim_next():
+    """Atomically claim the next due task, or return None when nothing is due."""
+    while True:
+        now = datetime.utcnow()
+        task_id = db.session.query(Task.id).filter(
+            Task.status == 'queued',
+            Task.run_at <= now
+        ).order_by(Task.run_at).limit(1).scalar()
+        if task_id is None:
+            db.session.commit()
+            return None
+
+        # Another worker may claim the same row first; only one update wins
+        claimed = db.session.execute(
+            update(Task)
+            .where(Task.id == task_id, Task.status == 'queued')
+            .values(status='running', started_at=now, attempts=Task.attempts + 1)
+        ).rowcount
+        db.session.commit()
+        if claimed:
+            return db.session.get(Task, task_id)
+
+
+def _retry_delay(attempts):
+    base = current_app.config['TASK_RETRY_BACKOFF']
+    delay = min(base * 2 ** (attempts - 1), current_app.config['TASK_RETRY_BACKOFF_MAX'])
+    return delay + random.uniform(0, base)
+
+
+def run_task(task):
+    """Run a claimed task, then record its outcome and timings."""
+    task_id, name = task.id, task.name
+    started = time.perf_counter()
+    try:
+        handler = _handlers.get(name)
+        if handler is None:
+            raise LookupError(f'No handler registered for task {name!r}')
+        handler(**json.loads(task.payload))
+    except Exception as e:
+        db.session.rollback()
+        task = db.session.get(Task, task_id)
+        task.last_error = f'{type(e).__name__}: {e}'
+        if task.attempts < task.max_attempts:
+            task.status = 'queued'
+            task.run_at = datetime.utcnow() + timedelta(seconds=_retry_delay(task.attempts))
+        else:
+            task.status = 'failed'
+            task.finished_at = datetime.utcnow()
+        db.session.commit()
+        current_app.logger.warning('Task %s #%s failed (attempt %s/%s): %s',
+                                   name, task_id, task.attempts, task.max_attempts, task.last_error)
+        return False
+
+    task = db.session.get(Task, task_id)
+    task.status = 'done'
+    task.finished_at = datetime.utcnow()
+    db.session.commit()
+    current_app.logger.debug('Task %s #%s done in %.1f ms', name, task_id, (time.perf_counter() - started) * 1000)
+    return True
+
+
+def requeue_stale():
+    """Return tasks left running by a crashed worker to the queue, or fail them once out of attempts."""
+    now = datetime.utcnow()
+    cutoff = now - timedelta(seconds=current_app.config['TASK_VISIBILITY_TIMEOUT'])
+    stale = (Task.status == 'running', Task.started_at < cutoff)
+    failed = db.session.execute(
+        update(Task)
+        .where(*stale, Task.attempts >= Task.max_attempts)
+        .values(status='failed', finished_at=now, last_error='Worker stopped before the task finished')
+    ).rowcount
+    requeued = db.session.execute(
+        update(Task)
+        .where(*stale)
+        .values(status='queued', run_at=now)
+    ).rowcount
+    db.session.commit()
+    if failed:
+        current_app.logger.warning('Failed %s stale task(s) that ran out of attempts', failed)
+    return requeued
+
+
+def purge_finished():
+    """Delete completed tasks older than the retention period."""
+    cutoff = datetime.utcnow() - current_app.config['TASK_RETENTION']
+    purged = Task.query.filter(Task.status == 'done', Task.finished_at < cutoff).delete(synchronize_session=False)
+    db.session.commit()
+    return purged
+
+
+def percentile(values, fraction):
+    """Return the value at fraction (0-1) of the sorted values, or None when there are none."""
+    if not values:
+        return None
+    values = sorted(values)
+    return values[min(len(values) - 1, int(fraction * len(values)))]
+
+
+def task_stats(since=None):
+    """Return per-task counts and queue wait / run time percentiles in milliseconds."""
+    since = since or datetime.utcnow() - timedelta(days=1)
+    rows = db.session.query(
+        Task.name, Task.status, Task.run_at, Task.started_at, Task.finished_at
+    ).filter(Task.created_at >= since).all()
+
+    stats = {}
+    for name, status, run_at, started_at, finished_at in rows:
+        entry = stats.setdefault(name, {'queued': 0, 'running': 0, 'done': 0, 'failed': 0, 'wait': [], 'run': []})
+        entry[status] += 1
+        if status == 'done' and started_at and finished_at:
+            entry['wait'].append((started_at - run_at).total_seconds() * 1000)
+            entry['run'].append((finished_at - started_at).total_seconds() * 1000)
+
+    for entry in stats.values():
+        wait, run = entry.pop('wait'), entry.pop('run')
+        entry.update(
+            wait_p50_ms=percentile(wait, 0.5), wait_p95_ms=percentile(wait, 0.95),
+            run_p50_ms=percentile(run, 0.5), run_p95_ms=percentile(run, 0.95)
+        )
+    return stats
+
+
+class TaskWorker:
+    """Pool of threads that claim and run queued tasks for one app."""
+
+    def __init__(self, app, concurrency=1):
+        self.app = app
+        self.concurrency = concurrency
+        self._wakeup = threading.Event()
+        self._stopping = threading.Event()
+        self._threads = []
+
+    def start(self):
+        for i in range(self.concurrency):
+            thread = threading.Thread(target=self._run, args=(i == 0,), name=f'task-worker-{i}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def wake(self):
+        self._wakeup.set()
+
+    def stop(self, timeout=None):
+        self._stopping.set()
+        self._wakeup.set()
+        for thread in self._threads:
+            thread.join(timeout)
+
+    def _run(self, housekeeper):
+        with self.app.app_context():
+            poll_interval = self.app.config['TASK_POLL_INTERVAL']
+            next_housekeeping = 0
+            while not self._stopping.is_set():
+                ran = False
+                try:
+                    if housekeeper and time.monotonic() >= next_housekeeping:
+                        requeue_stale()
+                        purge_finished()
+                        next_housekeeping = time.monotonic() + self.app.config['TASK_VISIBILITY_TIMEOUT'] / 2
+
+                    task = claim_next()
+                    if task is not None:
+                        run_task(task)
+                        ran = True
+                except Exception:
+                    db.session.rollback()
+                    self.app.logger.exception('Task worker error')
+                finally:
+                    db.session.remove()
+
+                if not ran:
+                    self._wakeup.wait(poll_interval)
+                    self._wakeup.clear()
+
+
+def ensure_worker(app):
+    """Start app's in-process worker pool unless it is running or TASK_WORKER_THREADS is 0."""
+    with _start_lock:
+        worker = app.extensions.get('task_worker')
+        if worker is None and app.config['TASK_WORKER_THREADS'] > 0:
+            worker = start_worker(app, app.config['TASK_WORKER_THREADS'])
+    return worker
+
+
+def init_worker(app):
+    """Start the in-process worker pool when app serves its first request.
+
+    Tasks left from before a restart (queued, awaiting a retry, or stranded
+    by a crashed worker) then run without waiting for a new task to be
+    enqueued. Entry points that serve without a request first, such as
+    wsgi.after_fork(), call ensure_worker() themselves.
+    """
+    @app.before_request
+    def _start_task_worker():
+        if 'task_worker' not in app.extensions:
+            ensure_worker(app)
+
+
+def start_worker(app, concurrency):
+    """Start a worker pool for app and register it for after-commit wakeups."""
+    worker = TaskWorker(app, concurrency)
+    app.extensions['task_worker'] = worker
+    worker.start()
+    return worker
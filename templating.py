@@ -0,0 +1,19 @@
+import os
+from jinja2 import FileSystemBytecodeCache
+
+
+def configure_templates(app):
+    """Attach the shared bytecode cache to app's Jinja environment."""
+    cache_dir = app.config.get('TEMPLATE_CACHE_DIR')
+    if not cache_dir:
+        return
+    os.makedirs(cache_dir, exist_ok=True)
+    app.jinja_env.bytecode_cache = FileSystemBytecodeCache(cache_dir)
+
+
+def compile_templates(app):
+    """Compile every template app can load; returns the template names."""
+    names = app.jinja_env.list_templates()
+    for name in names:
+        app.jinja_env.get_template(name)
+    return names
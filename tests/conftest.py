@@ -0,0 +1,44 @@
+import os
+import sys
+
+import pytest
+
+# The app is a set of top-level modules in the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+@pytest.fixture
+def app(tmp_path, monkeypatch):
+    """App on a fresh SQLite database, with background tasks run by the test itself"""
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('SECRET_KEY', 'test')
+    monkeypatch.setenv('DATABASE_URL', f'sqlite:///{tmp_path / "test.db"}')
+    monkeypatch.setenv('PRERENDER_DIR', str(tmp_path / 'prerendered'))
+    monkeypatch.setenv('TEMPLATE_CACHE_DIR', str(tmp_path / 'jinja_cache'))
+    monkeypatch.setenv('RESUME_UPLOAD_FOLDER', str(tmp_path / 'resumes'))
+    monkeypatch.setenv('RATELIMIT_ENABLED', 'false')
+    monkeypatch.setenv('TASK_WORKER_THREADS', '0')
+
+    from app import create_app
+    from models import db
+
+    app = create_app()
+    app.config.update(TESTING=True, WTF_CSRF_ENABLED=False)
+    with app.app_context():
+        db.create_all()
+    yield app
+    with app.app_context():
+        db.session.remove()
+        db.engine.dispose()
+
+
+@pytest.fixture
+def run_tasks(app):
+    """Run every queued background task now"""
+    from tasks import claim_next, run_task
+
+    def run():
+        with app.app_context():
+            while (task := claim_next()) is not None:
+                run_task(task)
+    return run
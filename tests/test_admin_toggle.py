@@ -0,0 +1,68 @@
+import os
+from datetime import datetime
+
+import pytest
+
+from models import db, User, Job
+
+
+@pytest.fixture
+def admin_client(app):
+    with app.app_context():
+        admin = User(name='Admin', username='admin', email='admin@example.com', password='x', is_admin=True)
+        db.session.add(admin)
+        db.session.commit()
+        admin_id = admin.id
+
+    client = app.test_client()
+    with client.session_transaction() as session:
+        session['_user_id'] = str(admin_id)
+        session['_fresh'] = True
+        session['admin_authenticated'] = True
+    return client
+
+
+@pytest.fixture
+def job_id(app, admin_client):
+    with app.app_context():
+        job = Job(title='Prerendered Engineer', company='Acme', location='Remote', job_type='Full-time',
+                  experience_level='Mid', description='d' * 60, requirements='r' * 60,
+                  deadline=datetime(2030, 1, 1), status='inactive',
+                  user_id=User.query.filter_by(username='admin').one().id)
+        db.session.add(job)
+        db.session.commit()
+        return job.id
+
+
+def test_toggle_job_status(app, admin_client, job_id, run_tasks):
+    page = os.path.join(app.config['PRERENDER_DIR'], 'jobs', f'{job_id}.html')
+
+    response = admin_client.post(f'/admin/jobs/{job_id}/toggle-status')
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/admin/jobs'
+    run_tasks()
+    with app.app_context():
+        assert db.session.get(Job, job_id).status == 'active'
+    with open(page, encoding='utf-8') as f:
+        assert 'Prerendered Engineer' in f.read()
+
+    response = admin_client.post(f'/admin/jobs/{job_id}/toggle-status')
+    assert response.headers['Location'] == '/admin/jobs'
+    run_tasks()
+    with app.app_context():
+        assert db.session.get(Job, job_id).status == 'inactive'
+    assert not os.path.exists(page)
+
+
+def test_toggle_user_status(app, admin_client):
+    with app.app_context():
+        user = User(name='Someone', username='someone', email='someone@example.com', password='x')
+        db.session.add(user)
+        db.session.commit()
+        user_id = user.id
+
+    response = admin_client.post(f'/admin/users/{user_id}/toggle-status')
+    assert response.status_code == 302
+    assert response.headers['Location'] == '/admin/users'
+    with app.app_context():
+        assert db.session.get(User, user_id).is_active is False
@@ -0,0 +1,40 @@
+from app import create_app
+from models import db
+from tasks import ensure_worker
+from templating import compile_templates
+
+
+def warm_up(app):
+    """Do the work a cold app would otherwise do on its first requests."""
+    # Load every template into the Jinja cache, from the bytecode cache when warm
+    compile_templates(app)
+    app.url_map.update()
+
+    # Connect once so the dialect is initialised and a bad DATABASE_URL fails
+    # at boot, then close it: connections must not be inherited by workers
+    with app.app_context():
+        with db.engine.connect():
+            pass
+        db.engine.dispose()
+    return app
+
+
+def after_fork(app):
+    """Give a freshly forked worker its own connection pool and task workers."""
+    # Threads don't survive a fork, so forget any task worker the parent started
+    app.extensions.pop('task_worker', None)
+
+    with app.app_context():
+        # Leave the parent's connections, if any, for the parent to close
+        db.engine.dispose(close=False)
+        pool_size = getattr(db.engine.pool, 'size', lambda: 1)()
+        connections = [db.engine.connect() for _ in range(pool_size)]
+        for connection in connections:
+            connection.close()
+
+    # Start on boot rather than on the first request, so tasks left over
+    # from before a restart run even while the site is idle
+    ensure_worker(app)
+
+
+app = warm_up(create_app())